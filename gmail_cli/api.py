@@ -1,60 +1,313 @@
 """Gmail API wrapper."""
 
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from .auth import get_credentials, check_auth
 from .utils import format_email_address, format_date
 from .retry import with_retry
 import base64
 import re
+
+try:
+    # SIMD-accelerated drop-in codec; falls back to stdlib when not installed
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
+
+try:
+    # Fast C JSON parser for API responses; stdlib json is used otherwise
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
 from html import unescape as _html_unescape
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
 import os
 import tempfile
+import threading
 import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+
+
+# Attachment read/encode chunk size: 64 KiB rounded down to a multiple of 3,
+# so each chunk base64-encodes cleanly without interior padding.
+_ENCODE_CHUNK = 3 * 21845
+
+# Built discovery clients, cached per account. Building a service parses the
+# full discovery document and reflects every resource method, so constructing
+# several GmailAPI instances in one process should pay that cost only once.
+_SERVICE_CACHE = {}
+
+# Bounded pool for fanning out per-ID calls that have no batch endpoint
+# (e.g. filters.get). Sized explicitly for I/O-bound work instead of the
+# cpu_count-derived ThreadPoolExecutor default; threads are only spawned
+# on first use.
+_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="gmail-io")
+
+# At most this many BatchHttpRequests in flight at once. Each batch is
+# already 100 calls, so a small window keeps chunks overlapped without
+# tripping per-user rate limits.
+_BATCH_CONCURRENCY = threading.Semaphore(5)
+
+# httplib2 connections are not thread-safe, so each pool worker gets its own
+# authorized transport.
+_THREAD_LOCAL = threading.local()
+
+# LRU cache of get_message responses, keyed (account, id, format, fields).
+# Message content is immutable once delivered, but labelIds are not, so
+# mutating calls evict the affected entries.
+_MSG_CACHE = OrderedDict()
+_MSG_CACHE_MAX = 1024
+
+# Label list cache, keyed by account. Labels change rarely but are needed by
+# nearly every command that resolves a label name, so a short TTL removes a
+# round-trip from most invocations. Mutating label calls invalidate eagerly.
+_LABEL_CACHE = {}
+_LABEL_CACHE_TTL = 300
+
+# Largest original-body quote included when forwarding, in decoded bytes.
+# Longer bodies are truncated before base64-decoding so a pathological
+# multi-megabyte original never balloons the forward payload.
+_FORWARD_QUOTE_MAX = 256 * 1024
+
+# Encoded attachment payloads, keyed (path, size, mtime_ns). Sending the
+# same file to several recipients (or retrying a send) reuses the base64
+# text instead of re-reading and re-encoding the file each time; any
+# on-disk change rotates the key. Bounded LRU since payloads can be large.
+_ATTACHMENT_CACHE = OrderedDict()
+_ATTACHMENT_CACHE_MAX = 16
+
+# Small metadata objects (profile, filters, labels, drafts) fetched by ID,
+# keyed (account, kind, id) with a short TTL. The profile is immutable for
+# the life of a process, so it is stored without an expiry. Mutating calls
+# purge the affected kind.
+_META_CACHE = OrderedDict()
+_META_CACHE_MAX = 256
+_META_CACHE_TTL = 60
+
+
+def _response_model():
+    """Return a JSON model that parses responses with orjson when installed.
+
+    Full-format Gmail messages are large JSON documents, so swapping the
+    stdlib parser for orjson meaningfully cuts client-side CPU per call.
+    Returns None (use the client default) when orjson is unavailable.
+    """
+    if _orjson is None:
+        return None
+
+    from googleapiclient.model import JsonModel
+
+    class _OrjsonModel(JsonModel):
+        def deserialize(self, content):
+            body = _orjson.loads(content)
+            if self._data_wrapper and isinstance(body, dict) and "data" in body:
+                body = body["data"]
+            return body
+
+    return _OrjsonModel()
+
+
+def _build_service(account):
+    """Return (service, creds) for an account, reusing a cached client."""
+    cached = _SERVICE_CACHE.get(account)
+    if cached and cached[1].valid:
+        return cached
+
+    creds = check_auth(account)
+    if not creds:
+        raise Exception("Not authenticated. Run 'gmail init' first.")
+
+    # Imported here so commands that never talk to Gmail (help, config,
+    # contacts) skip loading the discovery machinery at startup.
+    from googleapiclient.discovery import build
+
+    # static_discovery uses the discovery document bundled with the client
+    # library, so no network fetch is needed to build the service.
+    import httplib2
+    import google_auth_httplib2
+
+    # An authorized transport over a disk-cached Http: unchanged responses
+    # revalidate as 304s across CLI runs instead of re-downloading.
+    http = google_auth_httplib2.AuthorizedHttp(
+        creds, http=httplib2.Http(cache=_http_cache_dir())
+    )
+    service = build(
+        "gmail", "v1", http=http,
+        cache_discovery=False, static_discovery=True,
+        model=_response_model(),
+    )
+    _SERVICE_CACHE[account] = (service, creds)
+    return service, creds
+
+
+def _http_cache_dir():
+    """Directory for httplib2's on-disk HTTP cache (ETag/304 revalidation).
+
+    Persisting validators across CLI runs lets unchanged responses come back
+    as cheap 304s instead of full bodies. Returns None if the directory
+    cannot be created, in which case transports run uncached.
+    """
+    from .utils import get_token_path
+
+    path = get_token_path().parent / ".gmail_httpcache"
+    try:
+        path.mkdir(mode=0o700, exist_ok=True)
+    except OSError:
+        return None
+    return str(path)
+
+
+def _headers_to_dict(headers):
+    """Index a Gmail payload header list by lowercased name.
+
+    Replaces repeated linear scans over the header list with one pass
+    followed by O(1) lookups.
+    """
+    return {h["name"].lower(): h["value"] for h in headers}
+
+
+def _meta_cache_get(key):
+    """Return a fresh cached metadata object, or None."""
+    import time
+
+    entry = _META_CACHE.get(key)
+    if entry is None:
+        return None
+    expires, value = entry
+    if expires is not None and time.monotonic() > expires:
+        del _META_CACHE[key]
+        return None
+    _META_CACHE.move_to_end(key)
+    return value
+
+
+def _meta_cache_put(key, value, ttl=_META_CACHE_TTL):
+    """Store a metadata object; ttl=None means no expiry."""
+    import time
+
+    expires = None if ttl is None else time.monotonic() + ttl
+    _META_CACHE[key] = (expires, value)
+    while len(_META_CACHE) > _META_CACHE_MAX:
+        _META_CACHE.popitem(last=False)
+
+
+def _iter_id_chunks(message_ids, size):
+    """Yield lists of at most ``size`` unique IDs from any iterable.
+
+    Works on plain lists and on generators alike, so callers can stream
+    IDs from a paginated listing straight into capped batch endpoints
+    without materializing the full set first. Duplicates (pasted or
+    scripted input) are dropped here so they never cost quota, and the
+    counts callers report stay accurate.
+    """
+    seen = set()
+    chunk = []
+    for message_id in message_ids:
+        if message_id in seen:
+            continue
+        seen.add(message_id)
+        chunk.append(message_id)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _meta_cache_purge(account, kind):
+    """Drop all cached entries of one kind for an account."""
+    stale = [k for k in _META_CACHE if k[0] == account and k[1] == kind]
+    for k in stale:
+        del _META_CACHE[k]
 
 
 class GmailAPI:
     """Wrapper for Gmail API operations."""
-    
+
     def __init__(self, account=None):
         """
         Initialize Gmail API service.
-        
+
         Args:
             account: Account name (optional). If None, uses default account.
         """
-        creds = check_auth(account)
-        if not creds:
-            raise Exception("Not authenticated. Run 'gmail init' first.")
-        
-        self.service = build("gmail", "v1", credentials=creds)
+        self.service, self.creds = _build_service(account)
         self.user_id = "me"
         self.account = account
+        # Bind the collection resources once: every users().messages() chain
+        # otherwise rebuilds the intermediate Resource objects per call.
+        self._users = self.service.users()
+        self._messages = self._users.messages()
+        self._attachments = self._messages.attachments()
+        self._threads = self._users.threads()
+        self._labels = self._users.labels()
+        self._drafts = self._users.drafts()
+        self._filters = self._users.settings().filters()
+        self._history = self._users.history()
     
     @with_retry()
     def get_profile(self):
-        """Get user profile information."""
+        """Get user profile information (cached for the process lifetime)."""
+        cached = _meta_cache_get((self.account, "profile", None))
+        if cached is not None:
+            return cached
         try:
-            profile = self.service.users().getProfile(userId=self.user_id).execute()
+            profile = self._users.getProfile(userId=self.user_id).execute()
+            _meta_cache_put((self.account, "profile", None), profile, ttl=None)
             return profile
         except HttpError as error:
             raise Exception(f"Failed to get profile: {error}")
     
+    @with_retry()
+    def list_history(self, start_history_id, history_types=None, label_id=None):
+        """
+        List mailbox change records since a previous historyId.
+
+        Idle polls cost one tiny delta response instead of re-listing the
+        mailbox. Returns None when the server reports the start id as
+        expired (HTTP 404, roughly a week old), signalling the caller to
+        re-baseline with a full listing.
+
+        Args:
+            start_history_id: historyId to report changes since
+            history_types: Optional list of record types (e.g. ["messageAdded"])
+            label_id: Only report changes touching this label
+
+        Returns:
+            Dictionary with "history" records and the latest "historyId",
+            or None if the start id has expired
+        """
+        try:
+            params = {"userId": self.user_id, "startHistoryId": start_history_id}
+            if history_types:
+                params["historyTypes"] = history_types
+            if label_id:
+                params["labelId"] = label_id
+            history = []
+            history_id = start_history_id
+            while True:
+                results = self._history.list(**params).execute()
+                history.extend(results.get("history", []))
+                history_id = results.get("historyId", history_id)
+                page_token = results.get("nextPageToken")
+                if not page_token:
+                    return {"history": history, "historyId": history_id}
+                params["pageToken"] = page_token
+        except HttpError as error:
+            if error.resp.status == 404:
+                return None
+            raise Exception(f"Failed to list history: {error}")
+
     @with_retry()
     def get_language_setting(self):
         """Get user's language setting."""
         try:
-            result = self.service.users().settings().getLanguage(userId=self.user_id).execute()
+            result = self._users.settings().getLanguage(userId=self.user_id).execute()
             return result.get('displayLanguage', 'en')
         except HttpError:
             return 'en'
     
     @with_retry()
-    def list_messages(self, max_results=10, label_ids=None, query=None):
+    def list_messages(self, max_results=10, label_ids=None, query=None, fields=None):
         """
         List messages from the user's mailbox.
         
@@ -62,6 +315,7 @@ class GmailAPI:
             max_results: Maximum number of messages to return
             label_ids: List of label IDs to filter by
             query: Query string to search for
+            fields: Partial-response field mask (e.g. "messages(id,threadId)")
         """
         try:
             params = {"userId": self.user_id, "maxResults": max_results}
@@ -72,14 +326,17 @@ class GmailAPI:
             if query:
                 params["q"] = query
             
-            results = self.service.users().messages().list(**params).execute()
+            if fields:
+                params["fields"] = fields
+            
+            results = self._messages.list(**params).execute()
             messages = results.get("messages", [])
             return messages
         except HttpError as error:
             raise Exception(f"Failed to list messages: {error}")
 
     @with_retry()
-    def list_messages_page(self, max_results=10, label_ids=None, query=None, page_token=None):
+    def list_messages_page(self, max_results=10, label_ids=None, query=None, page_token=None, fields=None):
         """List messages with pagination cursor."""
         try:
             params = {"userId": self.user_id, "maxResults": max_results}
@@ -89,7 +346,9 @@ class GmailAPI:
                 params["q"] = query
             if page_token:
                 params["pageToken"] = page_token
-            results = self.service.users().messages().list(**params).execute()
+            if fields:
+                params["fields"] = fields
+            results = self._messages.list(**params).execute()
             out = {"items": results.get("messages", [])}
             if results.get("nextPageToken"):
                 out["nextPageToken"] = results["nextPageToken"]
@@ -97,62 +356,290 @@ class GmailAPI:
         except HttpError as error:
             raise Exception(f"Failed to list messages: {error}")
     
+    def iter_messages(self, label_ids=None, query=None, page_size=100, max_results=None, fields=None):
+        """
+        Iterate over matching messages, fetching pages lazily.
+
+        Yields message stubs one at a time, requesting the next page only
+        when the current one is exhausted — memory stays O(page) and the
+        first result arrives after a single round-trip regardless of
+        mailbox size.
+
+        Args:
+            label_ids: List of label IDs to filter by
+            query: Query string to search for
+            page_size: Messages per page request
+            max_results: Stop after yielding this many (None = no limit)
+            fields: Partial-response field mask applied to every page
+        """
+        yielded = 0
+        page_token = None
+        while True:
+            page = self.list_messages_page(
+                max_results=page_size, label_ids=label_ids,
+                query=query, page_token=page_token, fields=fields,
+            )
+            for msg in page.get("items", []):
+                yield msg
+                yielded += 1
+                if max_results is not None and yielded >= max_results:
+                    return
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return
+
+    def iter_messages_with_details(self, label_ids=None, query=None, page_size=100,
+                                   format="metadata", fields=None, metadata_headers=None,
+                                   max_results=None):
+        """
+        Iterate over matching messages with details, pipelining pages.
+
+        While the current page's details are being batch-fetched, the next
+        ID page is already in flight on the worker pool — so page N+1's
+        listing overlaps page N's metadata fetch instead of serializing.
+
+        Args:
+            label_ids: List of label IDs to filter by
+            query: Query string to search for
+            page_size: Messages per page request
+            format: Format passed to the batched gets
+            fields: Partial-response field mask for the gets
+            metadata_headers: Header projection for format="metadata"
+            max_results: Stop after yielding this many (None = no limit)
+        """
+        yielded = 0
+        page = self.list_messages_page(
+            max_results=page_size, label_ids=label_ids, query=query,
+        )
+        while True:
+            next_future = None
+            token = page.get("nextPageToken")
+            if token:
+                next_future = _POOL.submit(
+                    self.list_messages_page, max_results=page_size,
+                    label_ids=label_ids, query=query, page_token=token,
+                )
+            ids = [m["id"] for m in page.get("items", [])]
+            for msg in self.get_messages_batch(
+                ids, format=format, fields=fields, metadata_headers=metadata_headers,
+            ):
+                yield msg
+                yielded += 1
+                if max_results is not None and yielded >= max_results:
+                    if next_future is not None:
+                        next_future.cancel()
+                    return
+            if next_future is None:
+                return
+            page = next_future.result()
+
+    def iter_threads(self, query=None, page_size=100, max_results=None):
+        """
+        Iterate over matching threads, fetching pages lazily.
+
+        Same contract as iter_messages, for threads.
+        """
+        yielded = 0
+        page_token = None
+        while True:
+            page = self.list_threads_page(
+                max_results=page_size, query=query, page_token=page_token
+            )
+            for thread in page.get("items", []):
+                yield thread
+                yielded += 1
+                if max_results is not None and yielded >= max_results:
+                    return
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return
+
     @with_retry()
-    def get_message(self, message_id, format="full"):
+    def get_message(self, message_id, format="full", fields=None, metadata_headers=None):
         """
         Get a specific message by ID.
         
         Args:
             message_id: The message ID
             format: Format of the message (full, metadata, minimal, raw)
+            fields: Partial-response field mask (e.g. "id,snippet,payload/headers")
+            metadata_headers: With format="metadata", return only these
+                headers instead of all of them
         """
+        cache_key = (
+            self.account, message_id, format, fields,
+            tuple(metadata_headers) if metadata_headers else None,
+        )
+        cached = _MSG_CACHE.get(cache_key)
+        if cached is not None:
+            _MSG_CACHE.move_to_end(cache_key)
+            return cached
+
+        # Message content is immutable per ID, so unprojected payloads
+        # persist on disk across runs (label IDs are stripped by the
+        # cache layer).
+        if not fields and not metadata_headers:
+            from . import cache as _disk_cache
+            stored = _disk_cache.get(self.account, message_id, format)
+            if stored is not None:
+                return stored
+
         try:
+            params = {"userId": self.user_id, "id": message_id, "format": format}
+            if fields:
+                params["fields"] = fields
+            if metadata_headers:
+                params["metadataHeaders"] = list(metadata_headers)
             message = (
-                self.service.users()
-                .messages()
-                .get(userId=self.user_id, id=message_id, format=format)
+                self._messages.get(**params)
                 .execute()
             )
+            _MSG_CACHE[cache_key] = message
+            if len(_MSG_CACHE) > _MSG_CACHE_MAX:
+                _MSG_CACHE.popitem(last=False)
+            if not fields and not metadata_headers:
+                _disk_cache.put(self.account, message_id, format, message)
             return message
         except HttpError as error:
             raise Exception(f"Failed to get message: {error}")
     
+    def get_message_headers(self, message_id, names):
+        """Return selected headers of a message as a {name: value} dict.
+
+        Rides on get_message's metadata projection and its caches, so a
+        repeat lookup for the same (message, headers) pair costs only the
+        dict build.
+
+        Args:
+            message_id: The message ID
+            names: Header names to fetch (e.g. ("Subject", "From"))
+
+        Returns:
+            Dict mapping header name to value, for the headers present
+        """
+        message = self.get_message(
+            message_id, format="metadata", metadata_headers=list(names)
+        )
+        return {
+            h["name"]: h["value"]
+            for h in message.get("payload", {}).get("headers", [])
+        }
+
+    def _evict_cached_message(self, message_id, disk=False):
+        """Drop any cached get_message entries for a mutated message.
+
+        Label-only mutations keep the disk copy (it stores no labelIds);
+        deletions pass disk=True to remove the payload entirely.
+        """
+        stale = [
+            key for key in _MSG_CACHE
+            if key[0] == self.account and key[1] == message_id
+        ]
+        for key in stale:
+            del _MSG_CACHE[key]
+        if disk:
+            from . import cache as _disk_cache
+            _disk_cache.evict(self.account, message_id)
+
+    def _evict_meta(self, kind, obj_id):
+        """Drop every cached projection of one label/filter/draft entry."""
+        stale = [
+            key for key in _META_CACHE
+            if key[:3] == (self.account, kind, obj_id)
+        ]
+        for key in stale:
+            _META_CACHE.pop(key, None)
+
+    def _invalidate_query_cache(self):
+        """Expire cached listings after any mutation that can change them."""
+        from . import cache as _disk_cache
+        _disk_cache.invalidate_queries(self.account)
+
     @with_retry()
-    def get_messages_batch(self, message_ids, format="metadata"):
+    def _execute_batch_chunk(self, request):
+        """Execute one capped batch call, retrying at chunk granularity.
+
+        A transient 429/5xx midway through a large operation re-sends only
+        the failed 1000-ID call, not the chunks that already succeeded.
         """
-        Fetch multiple messages in a single batch request.
-        
+        return request.execute()
+
+    @with_retry()
+    def _execute_chunk_threaded(self, request):
+        """_execute_batch_chunk for pool workers.
+
+        Request objects built from the service share its HTTP transport,
+        which is not thread-safe, so execution is pinned to the calling
+        thread's own transport and throttled by the batch semaphore.
+        """
+        with _BATCH_CONCURRENCY:
+            return request.execute(http=self._thread_http())
+
+    # Gmail caps batch requests at 100 calls each
+    BATCH_SIZE = 100
+    # batchModify/batchDelete accept up to 1000 IDs per call
+    BATCH_MODIFY_SIZE = 1000
+
+    # Headers needed to construct a threaded reply
+    REPLY_HEADERS = ("From", "Subject", "Cc", "Message-ID")
+
+    @with_retry()
+    def get_messages_batch(self, message_ids, format="metadata", fields=None, metadata_headers=None):
+        """
+        Fetch multiple messages in batched requests (one HTTP round-trip
+        per 100 messages instead of one per message).
+
         Args:
             message_ids: List of message IDs to fetch
             format: Format of the messages (full, metadata, minimal, raw)
-        
+            fields: Partial-response field mask applied to every get
+            metadata_headers: With format="metadata", return only these headers
+
         Returns:
             List of message dictionaries, preserving order
         """
         if not message_ids:
             return []
-        
+
         try:
-            batch = self.service.new_batch_http_request()
             results = {}
             errors = {}
-            
+            lock = threading.Lock()
+
             def callback(request_id, response, exception):
-                if exception:
-                    errors[request_id] = str(exception)
-                else:
-                    results[request_id] = response
-            
-            for msg_id in message_ids:
-                batch.add(
-                    self.service.users().messages().get(
-                        userId=self.user_id, id=msg_id, format=format
-                    ),
-                    callback=callback,
-                    request_id=msg_id
-                )
-            
-            batch.execute()
+                with lock:
+                    if exception:
+                        errors[request_id] = str(exception)
+                    else:
+                        results[request_id] = response
+
+            extra = {}
+            if fields:
+                extra["fields"] = fields
+            if metadata_headers:
+                extra["metadataHeaders"] = list(metadata_headers)
+
+            def run_chunk(chunk):
+                batch = self.service.new_batch_http_request()
+                for msg_id in chunk:
+                    batch.add(
+                        self._messages.get(
+                            userId=self.user_id, id=msg_id, format=format, **extra
+                        ),
+                        callback=callback,
+                        request_id=msg_id
+                    )
+                self._execute_chunk_threaded(batch)
+
+            chunks = [
+                message_ids[start:start + self.BATCH_SIZE]
+                for start in range(0, len(message_ids), self.BATCH_SIZE)
+            ]
+            if len(chunks) == 1:
+                run_chunk(chunks[0])
+            else:
+                # Overlap chunk round-trips instead of executing them serially
+                list(_POOL.map(run_chunk, chunks))
             
             # Return results in original order
             ordered_results = []
@@ -169,14 +656,86 @@ class GmailAPI:
             return ordered_results
         except HttpError as error:
             raise Exception(f"Failed to batch get messages: {error}")
+
+    def _thread_http(self):
+        """Per-thread authorized transport for parallel request execution."""
+        http = getattr(_THREAD_LOCAL, "http", None)
+        if http is None:
+            import httplib2
+            import google_auth_httplib2
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.creds, http=httplib2.Http(cache=_http_cache_dir())
+            )
+            _THREAD_LOCAL.http = http
+        return http
+
+    def get_messages_parallel(self, message_ids, format="full"):
+        """
+        Fetch multiple messages concurrently on the shared thread pool.
+
+        Unlike get_messages_batch this does one HTTP request per message,
+        so prefer the batch path; this exists for callers that need formats
+        or endpoints the batch endpoint cannot serve.
+
+        Returns:
+            List of message dictionaries, preserving order. Failures come
+            back as {"id": ..., "error": ...} entries.
+        """
+        def fetch(msg_id):
+            try:
+                request = self._messages.get(
+                    userId=self.user_id, id=msg_id, format=format
+                )
+                return request.execute(http=self._thread_http())
+            except Exception as e:
+                return {"id": msg_id, "error": str(e)}
+
+        return list(_POOL.map(fetch, message_ids))
+
+    def get_filters_parallel(self, filter_ids):
+        """
+        Fetch multiple filters concurrently (filters.get has no batch
+        endpoint). Failures come back as {"id": ..., "error": ...} entries.
+        """
+        def fetch(filter_id):
+            try:
+                request = (
+                    self._filters.get(userId=self.user_id, id=filter_id)
+                )
+                return request.execute(http=self._thread_http())
+            except Exception as e:
+                return {"id": filter_id, "error": str(e)}
+
+        return list(_POOL.map(fetch, filter_ids))
     
+    def list_and_fetch(self, query=None, max_results=10, format="metadata", label_ids=None):
+        """
+        List matching messages and hydrate them in one batched pass.
+
+        Chains list_messages -> get_messages_batch, so a 100-message page
+        costs two HTTP round-trips instead of 101.
+
+        Returns:
+            List of message dictionaries (failed fetches carry an "error" key)
+        """
+        stubs = self.list_messages(
+            max_results=max_results, label_ids=label_ids, query=query
+        )
+        if not stubs:
+            return []
+        return self.get_messages_batch([msg["id"] for msg in stubs], format=format)
+
     @with_retry()
     def search_with_details(
-        self, max_results=10, label_ids=None, query=None, format="metadata", page_token=None
+        self, max_results=10, label_ids=None, query=None, format="metadata", page_token=None,
+        fields=None, metadata_headers=None,
     ):
         """
         Search messages and return full details in batch.
 
+        fields and metadata_headers are forwarded to the per-message gets,
+        so listing UIs can pull just the headers they render.
+
         Returns a page dict: {"items": [...], "nextPageToken": ... (optional)}.
         """
         try:
@@ -187,7 +746,17 @@ class GmailAPI:
             if not message_list:
                 return {"items": []}
             message_ids = [msg["id"] for msg in message_list]
-            items = self.get_messages_batch(message_ids, format=format)
+            try:
+                items = self.get_messages_batch(
+                    message_ids, format=format,
+                    fields=fields, metadata_headers=metadata_headers,
+                )
+            except Exception:
+                # The batch endpoint occasionally rejects whole batches
+                # (quota, transient 5xx). Fall back to per-message fetches
+                # fanned out over the worker pool rather than failing the
+                # whole listing.
+                items = self.get_messages_parallel(message_ids, format=format)
             out = {"items": items}
             if page.get("nextPageToken"):
                 out["nextPageToken"] = page["nextPageToken"]
@@ -217,9 +786,7 @@ class GmailAPI:
                 message = self._create_message(to, subject, body, cc, html)
             
             sent_message = (
-                self.service.users()
-                .messages()
-                .send(userId=self.user_id, body=message)
+                self._messages.send(userId=self.user_id, body=message)
                 .execute()
             )
             return sent_message
@@ -242,6 +809,9 @@ class GmailAPI:
         carrying a derived text/plain fallback plus the text/html part, so
         clients that cannot render HTML still show readable text.
         """
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+
         if not html:
             return MIMEText(body, "plain")
         alternative = MIMEMultipart("alternative")
@@ -251,15 +821,52 @@ class GmailAPI:
 
     def _create_message(self, to, subject, body, cc=None, html=False):
         """Create a message for sending."""
+        # Fast path: a plain-text message whose headers are all ASCII needs
+        # none of the email.mime object graph — emit the RFC 5322 bytes
+        # directly. Non-ASCII headers and HTML bodies still go through the
+        # stdlib machinery, which handles header encoding and multipart.
+        if not html:
+            cc_str = cc if isinstance(cc, str) else (", ".join(cc) if cc else "")
+            if f"{to}{subject}{cc_str}".isascii():
+                return self._create_message_raw(to, subject, body, cc_str)
+
         message = self._body_part(body, html)
         message["to"] = to
         message["subject"] = subject
         if cc:
             message["cc"] = cc if isinstance(cc, str) else ", ".join(cc)
-        return {"raw": base64.urlsafe_b64encode(message.as_bytes()).decode()}
+        return {"raw": _b64.urlsafe_b64encode(message.as_bytes()).decode("ascii")}
+
+    def _create_message_raw(self, to, subject, body, cc=""):
+        """Emit plain-text RFC 5322 message bytes without email.mime objects.
+
+        ASCII bodies whose lines fit the RFC 5322 998-octet limit go out as
+        7bit with no body encoding at all — one copy, one third smaller on
+        the wire than base64. Anything else is base64-encoded, so any
+        (UTF-8) body text is safe; callers must ensure the header values
+        are ASCII.
+        """
+        lines = [f"To: {to}"]
+        if cc:
+            lines.append(f"Cc: {cc}")
+        lines.extend([
+            f"Subject: {subject}",
+            "MIME-Version: 1.0",
+            'Content-Type: text/plain; charset="utf-8"',
+        ])
+        if body.isascii() and max(map(len, body.split("\n")), default=0) < 998:
+            lines.append("Content-Transfer-Encoding: 7bit")
+            payload = body.replace("\n", "\r\n").encode("ascii")
+        else:
+            lines.append("Content-Transfer-Encoding: base64")
+            payload = _b64.b64encode(body.encode("utf-8"))
+        raw = "\r\n".join(lines).encode("ascii") + b"\r\n\r\n" + payload
+        return {"raw": _b64.urlsafe_b64encode(raw).decode("ascii")}
 
     def _create_message_with_attachments(self, to, subject, body, attachments, cc=None, html=False):
         """Create a message with attachments."""
+        from email.mime.multipart import MIMEMultipart
+
         message = MIMEMultipart()
         message["to"] = to
         message["subject"] = subject
@@ -269,26 +876,63 @@ class GmailAPI:
         message.attach(self._body_part(body, html))
         self._attach_files(message, attachments)
 
-        return {"raw": base64.urlsafe_b64encode(message.as_bytes()).decode()}
+        return {"raw": _b64.urlsafe_b64encode(message.as_bytes()).decode("ascii")}
     
-    def list_labels(self):
-        """List all labels in the user's mailbox."""
+    def list_labels(self, fields=None):
+        """List all labels in the user's mailbox.
+
+        Results are cached per account for a few minutes; pass fields to
+        bypass the cache with a partial response.
+
+        Args:
+            fields: Partial-response field mask (e.g. "labels(id,name)")
+        """
+        import time
+
+        if not fields:
+            cached = _LABEL_CACHE.get(self.account)
+            if cached and time.monotonic() - cached[0] < _LABEL_CACHE_TTL:
+                return cached[1]
         try:
+            params = {"userId": self.user_id}
+            if fields:
+                params["fields"] = fields
             results = (
-                self.service.users().labels().list(userId=self.user_id).execute()
+                self._labels.list(**params).execute()
             )
             labels = results.get("labels", [])
+            if not fields:
+                _LABEL_CACHE[self.account] = (time.monotonic(), labels)
             return labels
         except HttpError as error:
             raise Exception(f"Failed to list labels: {error}")
+
+    def get_label_by_name(self, name):
+        """Resolve a label by its display name (case-insensitive).
+
+        Served from the cached label list, so repeated name lookups cost
+        no extra API calls.
+
+        Args:
+            name: Label display name (e.g. "Work/Clients")
+
+        Returns:
+            The label dictionary, or None if no label has that name.
+        """
+        wanted = name.lower()
+        for label in self.list_labels():
+            if label.get("name", "").lower() == wanted:
+                return label
+        return None
     
-    def list_threads(self, max_results=10, query=None):
+    def list_threads(self, max_results=10, query=None, fields=None):
         """
         List email threads.
         
         Args:
             max_results: Maximum number of threads to return
             query: Query string to search for
+            fields: Partial-response field mask (e.g. "threads(id,snippet)")
         """
         try:
             params = {"userId": self.user_id, "maxResults": max_results}
@@ -296,12 +940,38 @@ class GmailAPI:
             if query:
                 params["q"] = query
             
-            results = self.service.users().threads().list(**params).execute()
+            if fields:
+                params["fields"] = fields
+            
+            results = self._threads.list(**params).execute()
             threads = results.get("threads", [])
             return threads
         except HttpError as error:
             raise Exception(f"Failed to list threads: {error}")
 
+    @with_retry()
+    def estimate_query(self, query):
+        """
+        Return Gmail's match-count estimate for a query without listing IDs.
+
+        Asks for a single-item page with only the resultSizeEstimate field,
+        so the answer costs one minimal round-trip regardless of how many
+        messages match.
+
+        Args:
+            query: Query string to estimate
+        """
+        try:
+            result = (
+                self._messages.list(
+                    userId=self.user_id, q=query, maxResults=1,
+                    fields="resultSizeEstimate",
+                ).execute()
+            )
+            return int(result.get("resultSizeEstimate", 0))
+        except HttpError as error:
+            raise Exception(f"Failed to estimate query results: {error}")
+
     def list_threads_page(self, max_results=10, query=None, page_token=None):
         """List email threads with pagination cursor."""
         try:
@@ -310,7 +980,7 @@ class GmailAPI:
                 params["q"] = query
             if page_token:
                 params["pageToken"] = page_token
-            results = self.service.users().threads().list(**params).execute()
+            results = self._threads.list(**params).execute()
             out = {"items": results.get("threads", [])}
             if results.get("nextPageToken"):
                 out["nextPageToken"] = results["nextPageToken"]
@@ -328,9 +998,7 @@ class GmailAPI:
         """
         try:
             thread = (
-                self.service.users()
-                .threads()
-                .get(userId=self.user_id, id=thread_id, format=format)
+                self._threads.get(userId=self.user_id, id=thread_id, format=format)
                 .execute()
             )
             return thread
@@ -354,11 +1022,10 @@ class GmailAPI:
                 body["removeLabelIds"] = remove_label_ids
             
             message = (
-                self.service.users()
-                .messages()
-                .modify(userId=self.user_id, id=message_id, body=body)
+                self._messages.modify(userId=self.user_id, id=message_id, body=body)
                 .execute()
             )
+            self._evict_cached_message(message_id)
             return message
         except HttpError as error:
             raise Exception(f"Failed to modify message: {error}")
@@ -376,31 +1043,150 @@ class GmailAPI:
             Dictionary with results
         """
         try:
-            if not message_ids:
-                return {"modified": 0, "errors": []}
-            
-            body = {"ids": message_ids}
+            modified = 0
+            # batchModify accepts at most 1000 IDs per call; chunking
+            # through an iterator lets paginated ID sources stream in,
+            # with each chunk submitted to the pool as soon as it fills
+            # so round-trips overlap instead of executing serially.
+            futures = []
+            for chunk in _iter_id_chunks(message_ids, self.BATCH_MODIFY_SIZE):
+                body = {"ids": chunk}
+                if add_label_ids:
+                    body["addLabelIds"] = add_label_ids
+                if remove_label_ids:
+                    body["removeLabelIds"] = remove_label_ids
+
+                futures.append((chunk, _POOL.submit(
+                    self._execute_chunk_threaded,
+                    self._messages.batchModify(userId=self.user_id, body=body),
+                )))
+            for chunk, future in futures:
+                future.result()
+                for msg_id in chunk:
+                    self._evict_cached_message(msg_id)
+                modified += len(chunk)
+            if modified:
+                self._invalidate_query_cache()
+            return {"modified": modified, "errors": []}
+        except HttpError as error:
+            raise Exception(f"Failed to batch modify messages: {error}")
+
+    def batch_modify_threads(self, thread_ids, add_label_ids=None, remove_label_ids=None):
+        """
+        Apply one label mutation to many threads in batched HTTP requests.
+
+        Threads have no native batchModify endpoint, so modify calls are
+        packed into one batch request per 100 threads. A thread modify
+        covers every message in the thread, which is cheaper per message
+        than messages.batchModify on threaded mailboxes.
+
+        Args:
+            thread_ids: Iterable of thread IDs to modify
+            add_label_ids: List of label IDs to add
+            remove_label_ids: List of label IDs to remove
+
+        Returns:
+            Dictionary with modified count and per-thread errors
+        """
+        try:
+            body = {}
             if add_label_ids:
                 body["addLabelIds"] = add_label_ids
             if remove_label_ids:
                 body["removeLabelIds"] = remove_label_ids
-            
-            result = (
-                self.service.users()
-                .messages()
-                .batchModify(userId=self.user_id, body=body)
-                .execute()
-            )
-            return {"modified": len(message_ids), "errors": []}
+
+            errors = {}
+
+            def callback(request_id, response, exception):
+                if exception:
+                    errors[request_id] = str(exception)
+
+            modified = 0
+            for chunk in _iter_id_chunks(thread_ids, self.BATCH_SIZE):
+                batch = self.service.new_batch_http_request()
+                for thread_id in chunk:
+                    batch.add(
+                        self._threads.modify(
+                            userId=self.user_id, id=thread_id, body=body
+                        ),
+                        callback=callback,
+                        request_id=thread_id
+                    )
+                self._execute_batch_chunk(batch)
+                modified += len(chunk)
+
+            if modified:
+                self._invalidate_query_cache()
+            return {
+                "modified": modified - len(errors),
+                "errors": [{"id": tid, "error": err} for tid, err in errors.items()],
+            }
+        except HttpError as error:
+            raise Exception(f"Failed to batch modify threads: {error}")
+
+    def modify_messages_batch(self, mutations):
+        """
+        Apply per-message label mutations in batched HTTP requests.
+
+        For a uniform mutation (same labels added/removed on every message)
+        prefer batch_modify_messages, which uses the native batchModify
+        endpoint. This path exists for mixed mutations, collapsing N modify
+        round-trips into one batch request per 100 messages.
+
+        Args:
+            mutations: Iterable of (message_id, add_label_ids, remove_label_ids)
+                tuples; either label list may be None.
+
+        Returns:
+            Dictionary with modified count and per-message errors
+        """
+        mutations = list(mutations)
+        if not mutations:
+            return {"modified": 0, "errors": []}
+
+        try:
+            errors = {}
+
+            def callback(request_id, response, exception):
+                if exception:
+                    errors[request_id] = str(exception)
+
+            for start in range(0, len(mutations), self.BATCH_SIZE):
+                batch = self.service.new_batch_http_request()
+                for msg_id, add_ids, remove_ids in mutations[start:start + self.BATCH_SIZE]:
+                    body = {}
+                    if add_ids:
+                        body["addLabelIds"] = add_ids
+                    if remove_ids:
+                        body["removeLabelIds"] = remove_ids
+                    batch.add(
+                        self._messages.modify(
+                            userId=self.user_id, id=msg_id, body=body
+                        ),
+                        callback=callback,
+                        request_id=msg_id
+                    )
+                self._execute_batch_chunk(batch)
+
+            for msg_id, _, _ in mutations:
+                self._evict_cached_message(msg_id)
+            return {
+                "modified": len(mutations) - len(errors),
+                "errors": [{"id": mid, "error": err} for mid, err in errors.items()],
+            }
         except HttpError as error:
             raise Exception(f"Failed to batch modify messages: {error}")
-    
+
     def mark_as_read(self, message_id):
-        """Mark a message as read."""
+        """Mark a message (or an iterable of messages) as read."""
+        if isinstance(message_id, (list, tuple, set)):
+            return self.batch_modify_messages(message_id, remove_label_ids=["UNREAD"])
         return self.modify_message(message_id, remove_label_ids=["UNREAD"])
-    
+
     def archive_message(self, message_id):
-        """Archive a message (remove INBOX label)."""
+        """Archive a message (or an iterable of messages) by removing INBOX."""
+        if isinstance(message_id, (list, tuple, set)):
+            return self.batch_modify_messages(message_id, remove_label_ids=["INBOX"])
         return self.modify_message(message_id, remove_label_ids=["INBOX"])
     
     def create_filter(self, criteria, action):
@@ -421,24 +1207,25 @@ class GmailAPI:
             }
             
             result = (
-                self.service.users()
-                .settings()
-                .filters()
-                .create(userId=self.user_id, body=filter_body)
+                self._filters.create(userId=self.user_id, body=filter_body)
                 .execute()
             )
             return result
         except HttpError as error:
             raise Exception(f"Failed to create filter: {error}")
     
-    def list_filters(self):
-        """List all Gmail filters."""
+    def list_filters(self, fields=None):
+        """List all Gmail filters.
+
+        Args:
+            fields: Partial-response field mask (e.g. "filter(id,criteria,action)")
+        """
         try:
+            params = {"userId": self.user_id}
+            if fields:
+                params["fields"] = fields
             results = (
-                self.service.users()
-                .settings()
-                .filters()
-                .list(userId=self.user_id)
+                self._filters.list(**params)
                 .execute()
             )
             filters = results.get("filter", [])
@@ -446,24 +1233,26 @@ class GmailAPI:
         except HttpError as error:
             raise Exception(f"Failed to list filters: {error}")
     
-    def get_filter(self, filter_id):
+    def get_filter(self, filter_id, fields=None):
         """
         Get a specific filter by ID.
-        
+
         Args:
             filter_id: The filter ID
-        
+            fields: Partial-response field mask (e.g. "id,criteria,action")
+
         Returns:
             Filter object
         """
+        cached = _meta_cache_get((self.account, "filter", filter_id, fields))
+        if cached is not None:
+            return cached
         try:
-            result = (
-                self.service.users()
-                .settings()
-                .filters()
-                .get(userId=self.user_id, id=filter_id)
-                .execute()
-            )
+            params = {"userId": self.user_id, "id": filter_id}
+            if fields:
+                params["fields"] = fields
+            result = self._filters.get(**params).execute()
+            _meta_cache_put((self.account, "filter", filter_id, fields), result)
             return result
         except HttpError as error:
             raise Exception(f"Failed to get filter: {error}")
@@ -477,12 +1266,10 @@ class GmailAPI:
         """
         try:
             (
-                self.service.users()
-                .settings()
-                .filters()
-                .delete(userId=self.user_id, id=filter_id)
+                self._filters.delete(userId=self.user_id, id=filter_id)
                 .execute()
             )
+            self._evict_meta("filter", filter_id)
         except HttpError as error:
             raise Exception(f"Failed to delete filter: {error}")
     
@@ -522,11 +1309,10 @@ class GmailAPI:
                 label_body["color"] = color
             
             result = (
-                self.service.users()
-                .labels()
-                .create(userId=self.user_id, body={"label": label_body})
+                self._labels.create(userId=self.user_id, body={"label": label_body})
                 .execute()
             )
+            _LABEL_CACHE.pop(self.account, None)
             return result
         except HttpError as error:
             raise Exception(f"Failed to create label: {error}")
@@ -535,11 +1321,11 @@ class GmailAPI:
         """Delete a label."""
         try:
             (
-                self.service.users()
-                .labels()
-                .delete(userId=self.user_id, id=label_id)
+                self._labels.delete(userId=self.user_id, id=label_id)
                 .execute()
             )
+            _LABEL_CACHE.pop(self.account, None)
+            self._evict_meta("label", label_id)
         except HttpError as error:
             raise Exception(f"Failed to delete label: {error}")
     
@@ -566,24 +1352,26 @@ class GmailAPI:
                 label_body["color"] = color
             
             result = (
-                self.service.users()
-                .labels()
-                .patch(userId=self.user_id, id=label_id, body={"label": label_body})
+                self._labels.patch(userId=self.user_id, id=label_id, body={"label": label_body})
                 .execute()
             )
+            _LABEL_CACHE.pop(self.account, None)
+            self._evict_meta("label", label_id)
             return result
         except HttpError as error:
             raise Exception(f"Failed to update label: {error}")
     
-    def get_label(self, label_id):
-        """Get a specific label by ID."""
+    def get_label(self, label_id, fields=None):
+        """Get a specific label by ID (cached briefly)."""
+        cached = _meta_cache_get((self.account, "label", label_id, fields))
+        if cached is not None:
+            return cached
         try:
-            result = (
-                self.service.users()
-                .labels()
-                .get(userId=self.user_id, id=label_id)
-                .execute()
-            )
+            params = {"userId": self.user_id, "id": label_id}
+            if fields:
+                params["fields"] = fields
+            result = self._labels.get(**params).execute()
+            _meta_cache_put((self.account, "label", label_id, fields), result)
             return result
         except HttpError as error:
             raise Exception(f"Failed to get label: {error}")
@@ -607,22 +1395,26 @@ class GmailAPI:
                 message = self._create_message(to, subject, body, cc, html)
 
             draft = (
-                self.service.users()
-                .drafts()
-                .create(userId=self.user_id, body={"message": message})
+                self._drafts.create(userId=self.user_id, body={"message": message})
                 .execute()
             )
             return draft
         except HttpError as error:
             raise Exception(f"Failed to create draft: {error}")
     
-    def list_drafts(self, max_results=10):
-        """List draft messages."""
+    def list_drafts(self, max_results=10, fields=None):
+        """List draft messages.
+
+        Args:
+            max_results: Maximum number of drafts to return
+            fields: Partial-response field mask (e.g. "drafts(id,message/id)")
+        """
         try:
+            params = {"userId": self.user_id, "maxResults": max_results}
+            if fields:
+                params["fields"] = fields
             results = (
-                self.service.users()
-                .drafts()
-                .list(userId=self.user_id, maxResults=max_results)
+                self._drafts.list(**params)
                 .execute()
             )
             drafts = results.get("drafts", [])
@@ -636,7 +1428,7 @@ class GmailAPI:
             params = {"userId": self.user_id, "maxResults": max_results}
             if page_token:
                 params["pageToken"] = page_token
-            results = self.service.users().drafts().list(**params).execute()
+            results = self._drafts.list(**params).execute()
             out = {"items": results.get("drafts", [])}
             if results.get("nextPageToken"):
                 out["nextPageToken"] = results["nextPageToken"]
@@ -644,15 +1436,17 @@ class GmailAPI:
         except HttpError as error:
             raise Exception(f"Failed to list drafts: {error}")
     
-    def get_draft(self, draft_id):
-        """Get a specific draft by ID."""
+    def get_draft(self, draft_id, fields=None):
+        """Get a specific draft by ID (cached briefly)."""
+        cached = _meta_cache_get((self.account, "draft", draft_id, fields))
+        if cached is not None:
+            return cached
         try:
-            result = (
-                self.service.users()
-                .drafts()
-                .get(userId=self.user_id, id=draft_id)
-                .execute()
-            )
+            params = {"userId": self.user_id, "id": draft_id}
+            if fields:
+                params["fields"] = fields
+            result = self._drafts.get(**params).execute()
+            _meta_cache_put((self.account, "draft", draft_id, fields), result)
             return result
         except HttpError as error:
             raise Exception(f"Failed to get draft: {error}")
@@ -661,11 +1455,10 @@ class GmailAPI:
         """Send an existing draft as-is (threaded if it was a threaded draft)."""
         try:
             result = (
-                self.service.users()
-                .drafts()
-                .send(userId=self.user_id, body={"id": draft_id})
+                self._drafts.send(userId=self.user_id, body={"id": draft_id})
                 .execute()
             )
+            self._evict_meta("draft", draft_id)
             return result
         except HttpError as error:
             raise Exception(f"Failed to send draft: {error}")
@@ -688,14 +1481,11 @@ class GmailAPI:
             existing = self.get_draft(draft_id)
             emsg = existing.get("message", {})
             payload = emsg.get("payload", {})
-            headers = payload.get("headers", [])
+            headers = _headers_to_dict(payload.get("headers", []))
 
-            def _h(name):
-                return next((h["value"] for h in headers if h["name"].lower() == name.lower()), None)
-
-            to = to if to is not None else (_h("To") or "")
-            subject = subject if subject is not None else (_h("Subject") or "")
-            cc = cc if cc is not None else _h("Cc")
+            to = to if to is not None else headers.get("to", "")
+            subject = subject if subject is not None else headers.get("subject", "")
+            cc = cc if cc is not None else headers.get("cc")
             if body is None:
                 body = self._extract_plain_body(payload)
 
@@ -705,6 +1495,7 @@ class GmailAPI:
                 specs = self._download_message_attachments(emsg.get("id"), payload)  # preserve
 
             if specs:
+                from email.mime.multipart import MIMEMultipart
                 msg = MIMEMultipart()
                 msg.attach(self._body_part(body, html))
                 for spec in specs:
@@ -719,24 +1510,33 @@ class GmailAPI:
             if cc:
                 msg["cc"] = cc if isinstance(cc, str) else ", ".join(cc)
 
-            message = {"raw": base64.urlsafe_b64encode(msg.as_bytes()).decode()}
+            message = {"raw": _b64.urlsafe_b64encode(msg.as_bytes()).decode("ascii")}
             draft = (
-                self.service.users()
-                .drafts()
-                .update(userId=self.user_id, id=draft_id, body={"message": message})
+                self._drafts.update(userId=self.user_id, id=draft_id, body={"message": message})
                 .execute()
             )
+            self._evict_meta("draft", draft_id)
             return draft
         except HttpError as error:
             raise Exception(f"Failed to update draft: {error}")
 
+    @staticmethod
+    def _decode_body_data(data):
+        """Decode one base64url body field to text.
+
+        Appends slack padding — Gmail sometimes strips "=" from body data,
+        which the strict decoder rejects — and decodes to str exactly once
+        with errors="replace".
+        """
+        return _b64.urlsafe_b64decode(data + "===").decode("utf-8", "replace")
+
     def _extract_plain_body(self, payload):
         """Return the text/plain body from a message payload (recursively)."""
         def walk(p):
             if p.get("mimeType") == "text/plain":
                 data = p.get("body", {}).get("data")
                 if data:
-                    return base64.urlsafe_b64decode(data).decode("utf-8", "replace")
+                    return self._decode_body_data(data)
             for sub in p.get("parts", []) or []:
                 t = walk(sub)
                 if t:
@@ -755,11 +1555,11 @@ class GmailAPI:
             body = p.get("body", {})
             if filename and body.get("attachmentId"):
                 att = (
-                    self.service.users().messages().attachments()
+                    self._messages.attachments()
                     .get(userId=self.user_id, messageId=message_id, id=body["attachmentId"])
                     .execute()
                 )
-                data = base64.urlsafe_b64decode(att.get("data", ""))
+                data = _b64.urlsafe_b64decode(att.get("data", ""))
                 specs.append((filename, p.get("mimeType", "application/octet-stream"), data))
             for sub in p.get("parts", []) or []:
                 walk(sub)
@@ -769,6 +1569,9 @@ class GmailAPI:
 
     def _attach_blob(self, message, filename, mimetype, data):
         """Attach raw bytes as a file part (used to preserve existing attachments)."""
+        from email.mime.base import MIMEBase
+        from email import encoders
+
         maintype, _, subtype = (mimetype or "application/octet-stream").partition("/")
         if not subtype:
             maintype, subtype = "application", "octet-stream"
@@ -834,11 +1637,11 @@ class GmailAPI:
             body = p.get("body", {})
             if filename and body.get("attachmentId") == attachment_id:
                 att = (
-                    self.service.users().messages().attachments()
+                    self._messages.attachments()
                     .get(userId=self.user_id, messageId=message_id, id=attachment_id)
                     .execute()
                 )
-                data = base64.urlsafe_b64decode(att.get("data", ""))
+                data = _b64.urlsafe_b64decode(att.get("data", ""))
                 specs.append((filename, p.get("mimeType", "application/octet-stream"), data))
             for sub in p.get("parts", []) or []:
                 walk(sub)
@@ -850,11 +1653,10 @@ class GmailAPI:
         """Delete a draft."""
         try:
             (
-                self.service.users()
-                .drafts()
-                .delete(userId=self.user_id, id=draft_id)
+                self._drafts.delete(userId=self.user_id, id=draft_id)
                 .execute()
             )
+            self._evict_meta("draft", draft_id)
             return {"id": draft_id, "deleted": True}
         except HttpError as error:
             raise Exception(f"Failed to delete draft: {error}")
@@ -863,25 +1665,106 @@ class GmailAPI:
         """Attach a list of local file paths to a MIME multipart message.
 
         Guesses each file's MIME type (per the Gmail API docs) so e.g. a PDF is
-        attached as application/pdf rather than a generic binary blob.
+        attached as application/pdf rather than a generic binary blob. Files
+        are read and base64-encoded in fixed-size chunks, so a large
+        attachment never holds both its raw bytes and a second full encoded
+        copy in memory at once (which is what encoders.encode_base64 costs).
         """
+        from email.mime.base import MIMEBase
+
         for filepath in attachments or []:
-            if not os.path.exists(filepath):
+            # One stat covers the existence check, the size needed to
+            # pre-size the encode buffer below, and the cache key.
+            try:
+                st = os.stat(filepath)
+            except OSError:
                 raise Exception(f"Attachment file not found: {filepath}")
+            raw_len = st.st_size
             ctype, encoding = mimetypes.guess_type(filepath)
             if ctype is None or encoding is not None:
                 ctype = "application/octet-stream"
             maintype, subtype = ctype.split("/", 1)
-            with open(filepath, "rb") as f:
-                part = MIMEBase(maintype, subtype)
-                part.set_payload(f.read())
-            encoders.encode_base64(part)
+            cache_key = (os.path.abspath(filepath), raw_len, st.st_mtime_ns)
+            payload = _ATTACHMENT_CACHE.get(cache_key)
+            if payload is not None:
+                _ATTACHMENT_CACHE.move_to_end(cache_key)
+            else:
+                # Base64 output size is known exactly from the file size, so
+                # the whole encoded payload goes into one pre-sized buffer
+                # instead of a list of chunks joined (and copied) at the end.
+                encoded = bytearray(4 * ((raw_len + 2) // 3))
+                pos = 0
+                with open(filepath, "rb") as f:
+                    while True:
+                        chunk = f.read(_ENCODE_CHUNK)
+                        if not chunk:
+                            break
+                        enc = _b64.b64encode(chunk)
+                        encoded[pos:pos + len(enc)] = enc
+                        pos += len(enc)
+                payload = bytes(encoded[:pos]).decode("ascii")
+                _ATTACHMENT_CACHE[cache_key] = payload
+                while len(_ATTACHMENT_CACHE) > _ATTACHMENT_CACHE_MAX:
+                    _ATTACHMENT_CACHE.popitem(last=False)
+            part = MIMEBase(maintype, subtype)
+            part.set_payload(payload)
+            part.add_header("Content-Transfer-Encoding", "base64")
             part.add_header(
                 "Content-Disposition",
                 f'attachment; filename="{os.path.basename(filepath)}"',
             )
             message.attach(part)
 
+    def _build_reply(self, original, body, reply_all=False, additional_cc=None, attachments=None):
+        """Build the reply payload for an already-fetched original message.
+
+        Pure message construction — no network. Returns the {"raw", "threadId"}
+        dict ready for messages.send or drafts.create.
+        """
+        headers = _headers_to_dict(original.get("payload", {}).get("headers", []))
+
+        # Extract original message details
+        from_email = headers.get("from", "")
+        subject = headers.get("subject", "")
+        cc_email = headers.get("cc", "")
+
+        # Build reply subject
+        reply_subject = subject
+        if not reply_subject.startswith("Re: "):
+            reply_subject = "Re: " + reply_subject
+
+        # Create reply message (multipart only when there are attachments)
+        from email.mime.text import MIMEText
+        if attachments:
+            from email.mime.multipart import MIMEMultipart
+            reply = MIMEMultipart()
+            reply.attach(MIMEText(body, "plain"))
+            self._attach_files(reply, attachments)
+        else:
+            reply = MIMEText(body)
+        reply["to"] = from_email
+        reply["subject"] = reply_subject
+
+        # Handle CC recipients
+        cc_list = []
+        if reply_all and cc_email:
+            cc_list.append(cc_email)
+        if additional_cc:
+            cc_list.append(additional_cc)
+        if cc_list:
+            reply["cc"] = ", ".join(cc_list)
+
+        # Set In-Reply-To and References headers for threading
+        message_id_header = headers.get("message-id", "")
+        if message_id_header:
+            reply["In-Reply-To"] = message_id_header
+            reply["References"] = message_id_header
+
+        return {
+            "raw": _b64.urlsafe_b64encode(reply.as_bytes()).decode("ascii"),
+            "threadId": original.get("threadId"),  # keep reply in same thread
+        }
+
     def reply_to_message(self, message_id, body, reply_all=False, additional_cc=None, attachments=None):
         """
         Reply to a message.
@@ -894,65 +1777,76 @@ class GmailAPI:
             attachments: Optional list of local file paths to attach
         """
         try:
-            # Get the original message
-            original = self.get_message(message_id, format="full")
-            headers = original.get("payload", {}).get("headers", [])
-
-            # Extract original message details
-            from_email = next((h["value"] for h in headers if h["name"] == "From"), "")
-            subject = next((h["value"] for h in headers if h["name"] == "Subject"), "")
-            to_email = next((h["value"] for h in headers if h["name"] == "To"), "")
-            cc_email = next((h["value"] for h in headers if h["name"] == "Cc"), "")
-
-            # Build reply subject
-            reply_subject = subject
-            if not reply_subject.startswith("Re: "):
-                reply_subject = f"Re: {reply_subject}"
-
-            # Create reply message (multipart only when there are attachments)
-            if attachments:
-                reply = MIMEMultipart()
-                reply.attach(MIMEText(body, "plain"))
-                self._attach_files(reply, attachments)
-            else:
-                reply = MIMEText(body)
-            reply["to"] = from_email
-            reply["subject"] = reply_subject
+            # The reply only needs a few headers and the threadId, not the
+            # full decoded body tree.
+            original = self.get_message(
+                message_id, format="metadata",
+                metadata_headers=self.REPLY_HEADERS,
+            )
+            message = self._build_reply(original, body, reply_all, additional_cc, attachments)
 
-            # Handle CC recipients
-            cc_list = []
-            if reply_all and cc_email:
-                cc_list.append(cc_email)
-            if additional_cc:
-                cc_list.append(additional_cc)
-            
-            if cc_list:
-                reply["cc"] = ", ".join(cc_list)
-            
-            # Set In-Reply-To and References headers for threading
-            message_id_header = next((h["value"] for h in headers if h["name"] == "Message-ID"), "")
-            if message_id_header:
-                reply["In-Reply-To"] = message_id_header
-                reply["References"] = message_id_header
-            
-            # Get the thread ID from the original message
-            thread_id = original.get("threadId")
-            
-            message = {
-                "raw": base64.urlsafe_b64encode(reply.as_bytes()).decode(),
-                "threadId": thread_id  # Add threadId to keep reply in same thread
-            }
-            
             sent_message = (
-                self.service.users()
-                .messages()
-                .send(userId=self.user_id, body=message)
+                self._messages.send(userId=self.user_id, body=message)
                 .execute()
             )
             return sent_message
         except HttpError as error:
             raise Exception(f"Failed to reply to message: {error}")
 
+    def reply_to_messages(self, items, reply_all=False):
+        """
+        Reply to many messages in two batched phases: one batch fetch of the
+        originals, then one batch of sends — 2 round-trips per 100 replies
+        instead of 2 per reply.
+
+        Args:
+            items: Iterable of (message_id, body) pairs
+            reply_all: If True, CC the original recipients on every reply
+
+        Returns:
+            Dictionary with sent count and per-message errors
+        """
+        items = list(items)
+        if not items:
+            return {"sent": 0, "errors": []}
+
+        try:
+            originals = self.get_messages_batch(
+                [msg_id for msg_id, _ in items], format="full"
+            )
+            errors = {}
+            payloads = []
+            for (msg_id, body), original in zip(items, originals):
+                if "error" in original and "payload" not in original:
+                    errors[msg_id] = original["error"]
+                    continue
+                payloads.append(
+                    (msg_id, self._build_reply(original, body, reply_all))
+                )
+
+            def callback(request_id, response, exception):
+                if exception:
+                    errors[request_id] = str(exception)
+
+            for start in range(0, len(payloads), self.BATCH_SIZE):
+                batch = self.service.new_batch_http_request()
+                for msg_id, message in payloads[start:start + self.BATCH_SIZE]:
+                    batch.add(
+                        self._messages.send(
+                            userId=self.user_id, body=message
+                        ),
+                        callback=callback,
+                        request_id=msg_id
+                    )
+                self._execute_batch_chunk(batch)
+
+            return {
+                "sent": len(items) - len(errors),
+                "errors": [{"id": mid, "error": err} for mid, err in errors.items()],
+            }
+        except HttpError as error:
+            raise Exception(f"Failed to batch reply: {error}")
+
     def draft_reply(self, message_id, body, reply_all=False, additional_cc=None, attachments=None):
         """
         Create a DRAFT reply that stays in the original thread.
@@ -969,22 +1863,27 @@ class GmailAPI:
             attachments: Optional list of local file paths to attach
         """
         try:
-            # Get the original message
-            original = self.get_message(message_id, format="full")
-            headers = original.get("payload", {}).get("headers", [])
+            # Only a few headers and the threadId are needed to draft a reply
+            original = self.get_message(
+                message_id, format="metadata",
+                metadata_headers=self.REPLY_HEADERS,
+            )
+            headers = _headers_to_dict(original.get("payload", {}).get("headers", []))
 
             # Extract original message details
-            from_email = next((h["value"] for h in headers if h["name"] == "From"), "")
-            subject = next((h["value"] for h in headers if h["name"] == "Subject"), "")
-            cc_email = next((h["value"] for h in headers if h["name"] == "Cc"), "")
+            from_email = headers.get("from", "")
+            subject = headers.get("subject", "")
+            cc_email = headers.get("cc", "")
 
             # Build reply subject
             reply_subject = subject
             if not reply_subject.startswith("Re: "):
-                reply_subject = f"Re: {reply_subject}"
+                reply_subject = "Re: " + reply_subject
 
             # Create reply message (multipart only when there are attachments)
+            from email.mime.text import MIMEText
             if attachments:
+                from email.mime.multipart import MIMEMultipart
                 reply = MIMEMultipart()
                 reply.attach(MIMEText(body, "plain"))
                 self._attach_files(reply, attachments)
@@ -1003,7 +1902,7 @@ class GmailAPI:
                 reply["cc"] = ", ".join(cc_list)
 
             # Set In-Reply-To and References headers for threading
-            message_id_header = next((h["value"] for h in headers if h["name"] == "Message-ID"), "")
+            message_id_header = headers.get("message-id", "")
             if message_id_header:
                 reply["In-Reply-To"] = message_id_header
                 reply["References"] = message_id_header
@@ -1012,20 +1911,91 @@ class GmailAPI:
             thread_id = original.get("threadId")
 
             message = {
-                "raw": base64.urlsafe_b64encode(reply.as_bytes()).decode(),
+                "raw": _b64.urlsafe_b64encode(reply.as_bytes()).decode("ascii"),
                 "threadId": thread_id,  # keep the draft in the same thread
             }
 
             draft = (
-                self.service.users()
-                .drafts()
-                .create(userId=self.user_id, body={"message": message})
+                self._drafts.create(userId=self.user_id, body={"message": message})
                 .execute()
             )
             return draft
         except HttpError as error:
             raise Exception(f"Failed to create draft reply: {error}")
 
+    @staticmethod
+    def _decode_quote(data):
+        """Decode a base64url body for quoting, capped at _FORWARD_QUOTE_MAX.
+
+        Oversized bodies are truncated in encoded form — cut to a 4-aligned
+        length so the base64 stays valid — and decoded with errors="replace"
+        in case the cut lands mid-codepoint.
+        """
+        limit = 4 * ((_FORWARD_QUOTE_MAX + 2) // 3)
+        if len(data) <= limit:
+            return _b64.urlsafe_b64decode(data).decode("utf-8", "replace")
+        truncated = data[: limit - (limit % 4)]
+        text = _b64.urlsafe_b64decode(truncated).decode("utf-8", "replace")
+        return text + "\n[... original message truncated ...]"
+
+    def _build_forward(self, original, to, body=None, attachments=None):
+        """Build the forward payload for an already-fetched original message.
+
+        Pure message construction — no network. Returns the {"raw": ...}
+        dict ready for messages.send.
+        """
+        headers = _headers_to_dict(original.get("payload", {}).get("headers", []))
+
+        # Extract original message details
+        subject = headers.get("subject", "")
+        from_email = headers.get("from", "")
+        date = headers.get("date", "")
+
+        # Build forward subject
+        forward_subject = subject
+        if not forward_subject.startswith("Fwd: "):
+            forward_subject = "Fwd: " + forward_subject
+
+        # Build forward body
+        forward_body = body or ""
+        forward_body += f"\n\n---------- Forwarded message ----------\n"
+        forward_body += f"From: {from_email}\n"
+        forward_body += f"Date: {date}\n"
+        forward_body += f"Subject: {subject}\n"
+        forward_body += f"To: {to}\n\n"
+
+        # Extract original body
+        payload = original.get("payload", {})
+        original_body = ""
+        if "parts" in payload:
+            for part in payload["parts"]:
+                if part.get("mimeType") == "text/plain":
+                    data = part.get("body", {}).get("data")
+                    if data:
+                        original_body = self._decode_quote(data)
+                        break
+        else:
+            if payload.get("mimeType") == "text/plain":
+                data = payload.get("body", {}).get("data")
+                if data:
+                    original_body = self._decode_quote(data)
+
+        forward_body += original_body
+
+        # Create forward message (multipart only when there are attachments)
+        from email.mime.text import MIMEText
+        if attachments:
+            from email.mime.multipart import MIMEMultipart
+            forward = MIMEMultipart()
+            forward.attach(MIMEText(forward_body, "plain"))
+            self._attach_files(forward, attachments)
+        else:
+            forward = MIMEText(forward_body)
+        forward["to"] = to
+        forward["subject"] = forward_subject
+
+        return {"raw": _b64.urlsafe_b64encode(forward.as_bytes()).decode("ascii")}
+
     def forward_message(self, message_id, to, body=None, attachments=None):
         """
         Forward a message.
@@ -1037,79 +2007,120 @@ class GmailAPI:
             attachments: Optional list of local file paths to attach
         """
         try:
-            # Get the original message
             original = self.get_message(message_id, format="full")
-            headers = original.get("payload", {}).get("headers", [])
-            
-            # Extract original message details
-            subject = next((h["value"] for h in headers if h["name"] == "Subject"), "")
-            from_email = next((h["value"] for h in headers if h["name"] == "From"), "")
-            date = next((h["value"] for h in headers if h["name"] == "Date"), "")
-            
-            # Build forward subject
-            forward_subject = subject
-            if not forward_subject.startswith("Fwd: "):
-                forward_subject = f"Fwd: {forward_subject}"
-            
-            # Build forward body
-            forward_body = body or ""
-            forward_body += f"\n\n---------- Forwarded message ----------\n"
-            forward_body += f"From: {from_email}\n"
-            forward_body += f"Date: {date}\n"
-            forward_body += f"Subject: {subject}\n"
-            forward_body += f"To: {to}\n\n"
-            
-            # Extract original body
-            payload = original.get("payload", {})
-            original_body = ""
-            if "parts" in payload:
-                for part in payload["parts"]:
-                    if part.get("mimeType") == "text/plain":
-                        data = part.get("body", {}).get("data")
-                        if data:
-                            original_body = base64.urlsafe_b64decode(data).decode("utf-8")
-                            break
-            else:
-                if payload.get("mimeType") == "text/plain":
-                    data = payload.get("body", {}).get("data")
-                    if data:
-                        original_body = base64.urlsafe_b64decode(data).decode("utf-8")
-            
-            forward_body += original_body
-            
-            # Create forward message (multipart only when there are attachments)
-            if attachments:
-                forward = MIMEMultipart()
-                forward.attach(MIMEText(forward_body, "plain"))
-                self._attach_files(forward, attachments)
-            else:
-                forward = MIMEText(forward_body)
-            forward["to"] = to
-            forward["subject"] = forward_subject
-            
-            message = {"raw": base64.urlsafe_b64encode(forward.as_bytes()).decode()}
-            
+            message = self._build_forward(original, to, body, attachments)
+
             sent_message = (
-                self.service.users()
-                .messages()
-                .send(userId=self.user_id, body=message)
+                self._messages.send(userId=self.user_id, body=message)
                 .execute()
             )
             return sent_message
         except HttpError as error:
             raise Exception(f"Failed to forward message: {error}")
+
+    def forward_messages(self, items, body=None):
+        """
+        Forward many messages in two batched phases, mirroring
+        reply_to_messages: one batch fetch of the originals, then one
+        batch of sends.
+
+        Args:
+            items: Iterable of (message_id, to) pairs
+            body: Optional forward message body applied to every forward
+
+        Returns:
+            Dictionary with sent count and per-message errors
+        """
+        items = list(items)
+        if not items:
+            return {"sent": 0, "errors": []}
+
+        try:
+            originals = self.get_messages_batch(
+                [msg_id for msg_id, _ in items], format="full"
+            )
+            errors = {}
+            payloads = []
+            for (msg_id, to), original in zip(items, originals):
+                if "error" in original and "payload" not in original:
+                    errors[msg_id] = original["error"]
+                    continue
+                payloads.append(
+                    (msg_id, self._build_forward(original, to, body))
+                )
+
+            def callback(request_id, response, exception):
+                if exception:
+                    errors[request_id] = str(exception)
+
+            for start in range(0, len(payloads), self.BATCH_SIZE):
+                batch = self.service.new_batch_http_request()
+                for msg_id, message in payloads[start:start + self.BATCH_SIZE]:
+                    batch.add(
+                        self._messages.send(
+                            userId=self.user_id, body=message
+                        ),
+                        callback=callback,
+                        request_id=msg_id
+                    )
+                self._execute_batch_chunk(batch)
+
+            return {
+                "sent": len(items) - len(errors),
+                "errors": [{"id": mid, "error": err} for mid, err in errors.items()],
+            }
+        except HttpError as error:
+            raise Exception(f"Failed to batch forward: {error}")
     
-    def block_sender(self, email):
+    def block_sender(self, email, backfill=True):
         """
-        Block a sender by creating a filter that marks their emails as spam.
-        
+        Block a sender by creating a filter that marks their emails as spam,
+        optionally sweeping their existing messages to spam as well.
+
+        The filter only affects future mail, so the backfill lists up to 500
+        existing messages from the sender and batch-moves them to SPAM. The
+        filter creation runs on the worker pool overlapped with the listing,
+        so blocking costs one round-trip time instead of two.
+
         Args:
             email: Email address to block
+            backfill: If True, also move the sender's existing messages to spam
+
+        Returns:
+            The created filter, with a "backfilled" count when backfill ran
         """
         try:
             criteria = {"from": email}
             action = {"addLabelIds": ["SPAM"], "removeLabelIds": ["INBOX"]}
-            return self.create_filter(criteria, action)
+            if not backfill:
+                return self.create_filter(criteria, action)
+
+            # The pool side must not share the service's transport with the
+            # listing below — httplib2 is not thread-safe — so the create
+            # request executes on the worker's thread-local transport.
+            filter_future = _POOL.submit(
+                self._execute_chunk_threaded,
+                self._filters.create(
+                    userId=self.user_id,
+                    body={"criteria": criteria, "action": action},
+                ),
+            )
+            backfilled = 0
+            try:
+                stubs = self.list_messages(
+                    max_results=500, query=f"from:{email}",
+                    fields="messages/id",
+                )
+                if stubs:
+                    result = self.batch_modify_messages(
+                        [m["id"] for m in stubs],
+                        add_label_ids=["SPAM"], remove_label_ids=["INBOX"],
+                    )
+                    backfilled = result.get("modified", len(stubs))
+            finally:
+                created = filter_future.result()
+            created["backfilled"] = backfilled
+            return created
         except HttpError as error:
             raise Exception(f"Failed to block sender: {error}")
     
@@ -1123,11 +2134,10 @@ class GmailAPI:
         """
         try:
             (
-                self.service.users()
-                .messages()
-                .delete(userId=self.user_id, id=message_id)
+                self._messages.delete(userId=self.user_id, id=message_id)
                 .execute()
             )
+            self._evict_cached_message(message_id, disk=True)
         except HttpError as error:
             raise Exception(f"Failed to delete message: {error}")
     
@@ -1141,11 +2151,10 @@ class GmailAPI:
         """
         try:
             (
-                self.service.users()
-                .messages()
-                .trash(userId=self.user_id, id=message_id)
+                self._messages.trash(userId=self.user_id, id=message_id)
                 .execute()
             )
+            self._evict_cached_message(message_id)
         except HttpError as error:
             raise Exception(f"Failed to trash message: {error}")
     
@@ -1158,11 +2167,10 @@ class GmailAPI:
         """
         try:
             (
-                self.service.users()
-                .messages()
-                .untrash(userId=self.user_id, id=message_id)
+                self._messages.untrash(userId=self.user_id, id=message_id)
                 .execute()
             )
+            self._evict_cached_message(message_id)
         except HttpError as error:
             raise Exception(f"Failed to untrash message: {error}")
     
@@ -1199,19 +2207,27 @@ class GmailAPI:
             raise Exception(f"Failed to batch untrash messages: {error}")
     
     def batch_delete_messages(self, message_ids):
-        """Batch permanently delete multiple messages."""
+        """Batch permanently delete multiple messages.
+
+        batchDelete accepts at most 1000 IDs per call, so larger inputs are
+        split into capped chunks instead of failing outright.
+        """
         try:
-            if not message_ids:
-                return {"deleted": 0, "errors": []}
-            
-            body = {"ids": message_ids}
-            (
-                self.service.users()
-                .messages()
-                .batchDelete(userId=self.user_id, body=body)
-                .execute()
-            )
-            return {"deleted": len(message_ids), "errors": []}
+            deleted = 0
+            futures = []
+            for chunk in _iter_id_chunks(message_ids, self.BATCH_MODIFY_SIZE):
+                futures.append((chunk, _POOL.submit(
+                    self._execute_chunk_threaded,
+                    self._messages.batchDelete(userId=self.user_id, body={"ids": chunk}),
+                )))
+            for chunk, future in futures:
+                future.result()
+                for msg_id in chunk:
+                    self._evict_cached_message(msg_id, disk=True)
+                deleted += len(chunk)
+            if deleted:
+                self._invalidate_query_cache()
+            return {"deleted": deleted, "errors": []}
         except HttpError as error:
             raise Exception(f"Failed to batch delete messages: {error}")
 
@@ -0,0 +1,208 @@
+"""Async Gmail API wrapper (aiohttp-based).
+
+Unlike :class:`gmail_cli.api.GmailAPI`, which goes through the blocking
+googleapiclient/httplib2 stack, this twin issues REST calls directly against
+``https://gmail.googleapis.com/gmail/v1`` with an ``aiohttp.ClientSession``,
+so async callers can fetch or send many messages concurrently without
+serializing on the GIL. Requires the optional ``aiohttp`` dependency
+(``pip install gmail-cli-oauth[async]``).
+"""
+
+import asyncio
+
+from .auth import check_auth
+
+GMAIL_BASE_URL = "https://gmail.googleapis.com/gmail/v1"
+
+# Shared connection pool for all AsyncGmailAPI instances
+_CONNECTOR_LIMIT = 32
+
+
+def _aiohttp():
+    """Import aiohttp lazily so the sync CLI works without it installed."""
+    try:
+        import aiohttp
+    except ImportError:
+        raise Exception(
+            "aiohttp is required for AsyncGmailAPI. "
+            "Install it with: pip install aiohttp"
+        )
+    return aiohttp
+
+
+class AsyncGmailAPI:
+    """Async wrapper for Gmail API operations.
+
+    Use as an async context manager so the underlying HTTP session is
+    closed cleanly:
+
+        async with AsyncGmailAPI() as api:
+            messages = await api.list_messages(max_results=50)
+            details = await asyncio.gather(
+                *[api.get_message(m["id"]) for m in messages]
+            )
+    """
+
+    def __init__(self, account=None):
+        """
+        Initialize async Gmail API client.
+
+        Args:
+            account: Account name (optional). If None, uses default account.
+        """
+        creds = check_auth(account)
+        if not creds:
+            raise Exception("Not authenticated. Run 'gmail init' first.")
+
+        self.creds = creds
+        self.user_id = "me"
+        self.account = account
+        self._session = None
+
+    async def __aenter__(self):
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _ensure_session(self):
+        if self._session is None or self._session.closed:
+            aiohttp = _aiohttp()
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=_CONNECTOR_LIMIT)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the underlying HTTP session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    def _headers(self):
+        return {"Authorization": f"Bearer {self.creds.token}"}
+
+    async def _request(self, method, path, params=None, json_body=None):
+        """Issue one authenticated REST call and return the parsed JSON."""
+        session = await self._ensure_session()
+        url = f"{GMAIL_BASE_URL}/users/{self.user_id}/{path}"
+        async with session.request(
+            method, url, params=params, json=json_body, headers=self._headers()
+        ) as resp:
+            if resp.status >= 400:
+                text = await resp.text()
+                raise Exception(f"Gmail API error {resp.status}: {text}")
+            return await resp.json()
+
+    async def get_profile(self):
+        """Get user profile information."""
+        return await self._request("GET", "profile")
+
+    async def list_messages(self, max_results=10, label_ids=None, query=None):
+        """
+        List messages from the user's mailbox.
+
+        Args:
+            max_results: Maximum number of messages to return
+            label_ids: List of label IDs to filter by
+            query: Query string to search for
+        """
+        params = {"maxResults": max_results}
+        if label_ids:
+            params["labelIds"] = label_ids
+        if query:
+            params["q"] = query
+        results = await self._request("GET", "messages", params=params)
+        return results.get("messages", [])
+
+    async def get_message(self, message_id, format="full"):
+        """
+        Get a specific message by ID.
+
+        Args:
+            message_id: The message ID
+            format: Format of the message (full, metadata, minimal, raw)
+        """
+        return await self._request(
+            "GET", f"messages/{message_id}", params={"format": format}
+        )
+
+    async def get_messages(self, message_ids, format="metadata"):
+        """
+        Fetch multiple messages concurrently over the shared connection pool.
+
+        Args:
+            message_ids: List of message IDs to fetch
+            format: Format of the messages (full, metadata, minimal, raw)
+
+        Returns:
+            List of message dictionaries, preserving order. Failed fetches
+            are returned as {"id": ..., "error": ...} so one bad message
+            does not fail the whole fan-out.
+        """
+        results = await asyncio.gather(
+            *[self.get_message(mid, format=format) for mid in message_ids],
+            return_exceptions=True,
+        )
+        out = []
+        for msg_id, result in zip(message_ids, results):
+            if isinstance(result, Exception):
+                out.append({"id": msg_id, "error": str(result)})
+            else:
+                out.append(result)
+        return out
+
+    async def send_message(self, raw_message):
+        """
+        Send a message.
+
+        Args:
+            raw_message: dict with the base64url-encoded "raw" message
+                (as produced by GmailAPI._create_message)
+        """
+        return await self._request("POST", "messages/send", json_body=raw_message)
+
+    async def modify_message(self, message_id, add_label_ids=None, remove_label_ids=None):
+        """
+        Modify message labels.
+
+        Args:
+            message_id: The message ID
+            add_label_ids: List of label IDs to add
+            remove_label_ids: List of label IDs to remove
+        """
+        body = {}
+        if add_label_ids:
+            body["addLabelIds"] = add_label_ids
+        if remove_label_ids:
+            body["removeLabelIds"] = remove_label_ids
+        return await self._request(
+            "POST", f"messages/{message_id}/modify", json_body=body
+        )
+
+    async def run_blocking(self, fn, *args, **kwargs):
+        """
+        Run a blocking gmail_cli.api.GmailAPI call on the shared worker
+        pool without stalling the event loop.
+
+        Bridges endpoints this async client does not wrap natively, so a
+        mixed workload (labels + filters + drafts) can still fan out with
+        asyncio.gather:
+
+            api = GmailAPI()
+            labels, filters = await asyncio.gather(
+                async_api.run_blocking(api.list_labels),
+                async_api.run_blocking(api.list_filters),
+            )
+
+        Args:
+            fn: The blocking callable to run
+            *args, **kwargs: Arguments forwarded to fn
+        """
+        import functools
+        from .api import _POOL
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _POOL, functools.partial(fn, *args, **kwargs)
+        )
@@ -13,6 +13,10 @@ from .shared_auth import (
 )
 
 
+# Refresh proactively when the token has less than this long to live, so the
+# first Gmail call never pays the token-endpoint round-trip mid-request.
+REFRESH_MARGIN_SECONDS = 300
+
 # Gmail API scopes
 SCOPES = [
     "https://www.googleapis.com/auth/gmail.readonly",
@@ -59,9 +63,15 @@ def get_credentials(account=None):
             print(f"Warning: Could not load existing token: {e}")
             creds = None
     
+    # Check whether the token is still valid but about to expire
+    near_expiry = False
+    if creds and creds.valid and creds.expiry:
+        from datetime import datetime, timedelta
+        near_expiry = creds.expiry - datetime.utcnow() < timedelta(seconds=REFRESH_MARGIN_SECONDS)
+
     # If there are no (valid) credentials available, let the user log in
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
+    if not creds or not creds.valid or near_expiry:
+        if creds and (creds.expired or near_expiry) and creds.refresh_token:
             try:
                 creds.refresh(Request())
                 # Save refreshed token
@@ -123,9 +133,17 @@ def authenticate(account=None):
         # Get email address to use as account name if not provided
         if not account:
             from googleapiclient.discovery import build
-            temp_service = build("gmail", "v1", credentials=creds)
+            temp_service = build(
+                "gmail", "v1", credentials=creds,
+                cache_discovery=False, static_discovery=True,
+            )
             profile = temp_service.users().getProfile(userId="me").execute()
             account = profile.get("emailAddress", "default")
+            # Seed the profile cache so the follow-up verification in
+            # 'gmail init' reuses this fetch instead of repeating it.
+            from .api import _meta_cache_put
+            _meta_cache_put((None, "profile", None), profile, ttl=None)
+            _meta_cache_put((account, "profile", None), profile, ttl=None)
         
         # Save credentials to unified token file
         unified_token_path = get_unified_token_path(account)
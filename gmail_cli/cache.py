@@ -0,0 +1,201 @@
+"""Persistent on-disk cache for immutable message payloads.
+
+Message content for a given ID never changes, so full/raw/metadata payloads
+fetched once can be served from disk on every later run — repeat reads cost
+zero network. Label IDs are mutable, so they are stripped before a payload
+is written; callers that need labels fetch them live.
+
+The cache lives next to the token files and is safe to delete at any time
+(``gmail cache clear``). Set the GMAIL_CLI_NO_CACHE environment variable or
+use the ``--no-cache`` flag to bypass it for one invocation.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from .utils import get_token_path
+
+# Cap on cached payload files; oldest entries are pruned past this.
+MAX_ENTRIES = 2048
+
+# Formats whose payloads are immutable once delivered (after labelIds are
+# stripped). Projected responses (custom fields/metadataHeaders) vary per
+# call, so the API layer only consults the disk for unprojected fetches.
+CACHEABLE_FORMATS = ("full", "raw", "metadata")
+
+_disabled = os.environ.get("GMAIL_CLI_NO_CACHE") is not None
+
+
+def disable():
+    """Bypass the disk cache for the rest of this process."""
+    global _disabled
+    _disabled = True
+
+
+def _cache_dir():
+    path = get_token_path().parent / ".gmail_msgcache"
+    path.mkdir(mode=0o700, exist_ok=True)
+    return path
+
+
+def _entry_path(account, message_id, format):
+    key = f"{account or 'default'}\x00{message_id}\x00{format}"
+    return _cache_dir() / (hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+
+def get(account, message_id, format):
+    """Return a cached message payload, or None."""
+    if _disabled or format not in CACHEABLE_FORMATS:
+        return None
+    try:
+        with open(_entry_path(account, message_id, format)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def put(account, message_id, format, message):
+    """Store a message payload, stripping mutable label IDs first.
+
+    Failures are swallowed — a broken cache directory must never break a
+    fetch that already succeeded.
+    """
+    if _disabled or format not in CACHEABLE_FORMATS:
+        return
+    stored = {k: v for k, v in message.items() if k != "labelIds"}
+    try:
+        path = _entry_path(account, message_id, format)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(stored, f)
+        os.replace(tmp, path)
+        _prune()
+    except OSError:
+        pass
+
+
+def evict(account, message_id):
+    """Drop cached payloads for a deleted message."""
+    for format in CACHEABLE_FORMATS:
+        try:
+            os.unlink(_entry_path(account, message_id, format))
+        except OSError:
+            pass
+
+
+def _prune():
+    """Drop the oldest entries once the cache exceeds MAX_ENTRIES."""
+    try:
+        entries = [e for e in os.scandir(_cache_dir()) if e.name.endswith(".json")]
+        if len(entries) <= MAX_ENTRIES:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[: len(entries) - MAX_ENTRIES]:
+            os.unlink(entry.path)
+    except OSError:
+        pass
+
+
+def clear():
+    """Remove every cached payload. Returns the number of entries removed."""
+    removed = 0
+    try:
+        for entry in os.scandir(_cache_dir()):
+            if entry.name.endswith(".json"):
+                os.unlink(entry.path)
+                removed += 1
+    except OSError:
+        pass
+    return removed
+
+
+def stats():
+    """Return {"entries": n, "bytes": total} for the cache directory."""
+    entries = 0
+    size = 0
+    try:
+        for entry in os.scandir(_cache_dir()):
+            if entry.name.endswith(".json"):
+                entries += 1
+                size += entry.stat().st_size
+    except OSError:
+        pass
+    return {"entries": entries, "bytes": size}
+
+
+# --- Query-result cache -----------------------------------------------------
+#
+# messages.list results are volatile, so entries live for a short TTL and
+# are additionally stamped with a per-account mutation epoch: any batch
+# mutation bumps the epoch, expiring every cached listing for the account
+# at once. This serves the "check then act" and back-to-back batch-command
+# patterns without risking stale IDs after a mutation.
+
+QUERY_TTL = 60
+
+_QUERY_SUFFIX = "-q.json"
+
+
+def _query_path(account, query, max_results):
+    key = f"{account or 'default'}\x00{query}\x00{max_results}"
+    return _cache_dir() / (hashlib.sha1(key.encode()).hexdigest() + _QUERY_SUFFIX)
+
+
+def _epoch_path(account):
+    key = hashlib.sha1((account or "default").encode()).hexdigest()
+    return _cache_dir() / ("epoch-" + key)
+
+
+def _read_epoch(account):
+    try:
+        return int(_epoch_path(account).read_text())
+    except (OSError, ValueError):
+        return 0
+
+
+def invalidate_queries(account):
+    """Bump the account's mutation epoch, expiring its cached listings."""
+    if _disabled:
+        return
+    try:
+        path = _epoch_path(account)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(str(_read_epoch(account) + 1))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def query_get(account, query, max_results):
+    """Return the cached ID list for an identical recent listing, or None."""
+    if _disabled:
+        return None
+    path = _query_path(account, query, max_results)
+    try:
+        if time.time() - path.stat().st_mtime > QUERY_TTL:
+            return None
+        with open(path) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get("epoch") != _read_epoch(account):
+        return None
+    return entry.get("ids")
+
+
+def query_put(account, query, max_results, ids):
+    """Store a listing's ID list; failures are swallowed like put()."""
+    if _disabled:
+        return
+    try:
+        path = _query_path(account, query, max_results)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"epoch": _read_epoch(account), "ids": list(ids)}, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
@@ -3,7 +3,7 @@
 import json
 import os
 from pathlib import Path
-from .shared_auth import GOOGLE_CONFIG_DIR
+from .utils import GOOGLE_CONFIG_DIR
 
 
 PREFERENCES_FILE = GOOGLE_CONFIG_DIR / "preferences.json"
@@ -30,16 +30,34 @@ def ensure_preferences_file():
     return PREFERENCES_FILE
 
 
+# (mtime, parsed preferences) — see load_preferences.
+_PREFS_STATE = None
+
+
 def load_preferences():
-    """Load user preferences."""
+    """Load user preferences.
+
+    The parsed file is memoized against its mtime, so the read the cli
+    callback does on every invocation costs the disk round-trip once per
+    process while external edits are still picked up.
+    """
+    global _PREFS_STATE
     ensure_preferences_file()
     
+    try:
+        mtime = os.stat(PREFERENCES_FILE).st_mtime_ns
+    except OSError:
+        mtime = None
+    if _PREFS_STATE is not None and _PREFS_STATE[0] == mtime:
+        return _PREFS_STATE[1]
     try:
         with open(PREFERENCES_FILE) as f:
-            return json.load(f)
-    except:
+            prefs = json.load(f)
+    except (OSError, ValueError):
         # Return defaults if file is corrupted
         return get_default_preferences()
+    _PREFS_STATE = (mtime, prefs)
+    return prefs
 
 
 def save_preferences(preferences):
@@ -4,7 +4,7 @@ import json
 import os
 from pathlib import Path
 from typing import Dict, List, Optional
-from .shared_auth import GOOGLE_CONFIG_DIR
+from .utils import GOOGLE_CONFIG_DIR
 
 
 CONTACTS_FILE = GOOGLE_CONFIG_DIR / "contacts.json"
@@ -4,29 +4,78 @@ import json
 import os
 from pathlib import Path
 from datetime import datetime
-from .shared_auth import GOOGLE_CONFIG_DIR
+from .utils import GOOGLE_CONFIG_DIR
 
 
-HISTORY_FILE = GOOGLE_CONFIG_DIR / "history.json"
+# Append-only log, one JSON object per line. Recording an operation is a
+# single append instead of a full read-modify-rewrite of the log, and
+# readers only ever touch the tail — history/undo stay constant-time no
+# matter how large the log grows.
+HISTORY_FILE = GOOGLE_CONFIG_DIR / "history.jsonl"
+LEGACY_HISTORY_FILE = GOOGLE_CONFIG_DIR / "history.json"
 MAX_HISTORY_ENTRIES = 100
 
+# Readers parse at most this much from the end of the log; far more than
+# MAX_HISTORY_ENTRIES of typical entries fit in it.
+_TAIL_BYTES = 64 * 1024
+# Appends compact the log down to MAX_HISTORY_ENTRIES past this size.
+_COMPACT_BYTES = 512 * 1024
+
 
 def ensure_history_file():
-    """Ensure history file exists."""
+    """Ensure the history log exists, migrating the legacy JSON format."""
     GOOGLE_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    
+
     if not HISTORY_FILE.exists():
+        operations = []
+        if LEGACY_HISTORY_FILE.exists():
+            try:
+                with open(LEGACY_HISTORY_FILE) as f:
+                    operations = json.load(f).get("operations", [])
+            except (OSError, ValueError):
+                operations = []
         with open(HISTORY_FILE, "w") as f:
-            json.dump({"operations": []}, f, indent=2)
+            for operation in operations[-MAX_HISTORY_ENTRIES:]:
+                f.write(json.dumps(operation) + "\n")
         os.chmod(HISTORY_FILE, 0o600)
-    
+        if LEGACY_HISTORY_FILE.exists():
+            try:
+                LEGACY_HISTORY_FILE.unlink()
+            except OSError:
+                pass
+
     return HISTORY_FILE
 
 
+def _read_tail(limit):
+    """Parse up to ``limit`` operations from the end of the log.
+
+    Seeks to the last _TAIL_BYTES instead of reading the whole file; a
+    partial first line from landing mid-entry is discarded, as are any
+    corrupt lines.
+    """
+    with open(HISTORY_FILE, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        offset = max(0, size - _TAIL_BYTES)
+        f.seek(offset)
+        lines = f.read().splitlines()
+    if offset and lines:
+        lines = lines[1:]
+
+    operations = []
+    for line in lines[-limit:] if limit is not None else lines:
+        try:
+            operations.append(json.loads(line))
+        except ValueError:
+            continue
+    return operations
+
+
 def add_operation(operation_type, details, undoable=True, undo_func=None):
     """
     Add an operation to history.
-    
+
     Args:
         operation_type: Type of operation (e.g., 'send', 'delete', 'trash')
         details: Dict with operation details
@@ -34,10 +83,7 @@ def add_operation(operation_type, details, undoable=True, undo_func=None):
         undo_func: Function name/identifier for undo (if undoable)
     """
     ensure_history_file()
-    
-    with open(HISTORY_FILE) as f:
-        history = json.load(f)
-    
+
     operation = {
         "timestamp": datetime.utcnow().isoformat(),
         "type": operation_type,
@@ -45,43 +91,35 @@ def add_operation(operation_type, details, undoable=True, undo_func=None):
         "undoable": undoable,
         "undo_func": undo_func
     }
-    
-    history["operations"].append(operation)
-    
-    # Keep only last MAX_HISTORY_ENTRIES
-    if len(history["operations"]) > MAX_HISTORY_ENTRIES:
-        history["operations"] = history["operations"][-MAX_HISTORY_ENTRIES:]
-    
-    with open(HISTORY_FILE, "w") as f:
-        json.dump(history, f, indent=2)
-    
-    os.chmod(HISTORY_FILE, 0o600)
+
+    with open(HISTORY_FILE, "ab") as f:
+        f.write(json.dumps(operation).encode() + b"\n")
+
+    # The log is allowed to drift past MAX_HISTORY_ENTRIES between
+    # compactions; readers only look at the tail, so trimming lazily
+    # keeps the common append to a single write.
+    try:
+        if os.stat(HISTORY_FILE).st_size > _COMPACT_BYTES:
+            recent = _read_tail(MAX_HISTORY_ENTRIES)
+            with open(HISTORY_FILE, "w") as f:
+                for op in recent:
+                    f.write(json.dumps(op) + "\n")
+    except OSError:
+        pass
 
 
 def get_recent_operations(limit=10):
     """Get recent operations from history."""
     ensure_history_file()
-    
-    with open(HISTORY_FILE) as f:
-        history = json.load(f)
-    
-    operations = history.get("operations", [])
-    return operations[-limit:]
+    return _read_tail(limit)
 
 
 def get_last_undoable_operation():
     """Get the last undoable operation."""
     ensure_history_file()
-    
-    with open(HISTORY_FILE) as f:
-        history = json.load(f)
-    
-    operations = history.get("operations", [])
-    
-    # Find last undoable operation
-    for operation in reversed(operations):
+
+    for operation in reversed(_read_tail(None)):
         if operation.get("undoable"):
             return operation
-    
-    return None
 
+    return None
@@ -1,6 +1,7 @@
 """Retry logic with exponential backoff for API calls."""
 
 import time
+import random
 import logging
 from functools import wraps
 from googleapiclient.errors import HttpError
@@ -9,11 +10,27 @@ from googleapiclient.errors import HttpError
 logger = logging.getLogger(__name__)
 
 
-# HTTP status codes that should trigger retry
-RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+# HTTP status codes that should trigger retry. 429 (rate limit) is
+# retryable per Gmail guidance: back off and re-send the same request.
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 MAX_RETRIES = 3
 BACKOFF_FACTOR = 2
 INITIAL_DELAY = 1  # seconds
+MAX_DELAY = 32  # seconds
+
+
+def _retry_after_seconds(error):
+    """Return the server-requested Retry-After delay in seconds, if any."""
+    resp = getattr(error, "resp", None)
+    if resp is None:
+        return None
+    value = resp.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return min(float(value), MAX_DELAY)
+    except (TypeError, ValueError):
+        return None
 
 
 def is_retryable_error(error):
@@ -54,8 +71,14 @@ def with_retry(max_retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR, initial_d
                     if not is_retryable_error(e):
                         raise
                     
-                    # Calculate delay with exponential backoff
-                    delay = initial_delay * (backoff_factor ** attempt)
+                    # Calculate delay with exponential backoff, capped,
+                    # plus jitter so concurrent workers don't retry in
+                    # lockstep against the same rate limit.
+                    # A server-supplied Retry-After overrides the guess.
+                    delay = _retry_after_seconds(e)
+                    if delay is None:
+                        delay = min(MAX_DELAY, initial_delay * (backoff_factor ** attempt))
+                        delay += random.uniform(0, delay)
                     
                     logger.warning(
                         f"Attempt {attempt + 1}/{max_retries + 1} failed: {e}. "
@@ -2,49 +2,99 @@
 
 import json
 import os
+import re
 from pathlib import Path
-from .shared_auth import GOOGLE_CONFIG_DIR
+from .utils import GOOGLE_CONFIG_DIR
 
 
 TEMPLATES_DIR = GOOGLE_CONFIG_DIR / "templates"
 
 
+# orjson parses and serializes several times faster than stdlib json; fall
+# back transparently when it isn't installed.
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj):
+        return json.dumps(obj, indent=2).encode()
+
+
+_DIR_ENSURED = False
+
+
 def ensure_templates_dir():
-    """Ensure templates directory exists."""
-    TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
+    """Ensure templates directory exists (one mkdir per process)."""
+    global _DIR_ENSURED
+    if not _DIR_ENSURED:
+        TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
+        _DIR_ENSURED = True
     return TEMPLATES_DIR
 
 
+# path -> (mtime_ns, parsed template) — see _read_template.
+_TEMPLATE_CACHE = {}
+
+
+def _read_template(template_path):
+    """Parse a template file, memoized against its mtime.
+
+    Rendering the same template per recipient in a batch send otherwise
+    re-reads and re-parses the file each time; external edits are still
+    picked up via the mtime check. Returns a copy so callers can mutate.
+    """
+    try:
+        mtime = os.stat(template_path).st_mtime_ns
+    except OSError:
+        return None
+    entry = _TEMPLATE_CACHE.get(template_path)
+    if entry is not None and entry[0] == mtime:
+        return dict(entry[1])
+    try:
+        template = _loads(template_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    _TEMPLATE_CACHE[template_path] = (mtime, template)
+    return dict(template)
+
+
 def list_templates():
     """List all available email templates."""
-    ensure_templates_dir()
     templates = []
-    
-    for template_file in TEMPLATES_DIR.glob("*.json"):
-        try:
-            with open(template_file) as f:
-                template = json.load(f)
-                template["name"] = template_file.stem
-                templates.append(template)
-        except:
+
+    # scandir yields entries with cached file-type info in one pass,
+    # where glob() pattern-matches and re-stats every entry.
+    try:
+        with os.scandir(ensure_templates_dir()) as entries:
+            files = [
+                entry for entry in entries
+                if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)
+            ]
+    except OSError:
+        return []
+
+    for entry in files:
+        template = _read_template(Path(entry.path))
+        if template is None:
             continue
-    
+        template["name"] = entry.name[:-5]
+        templates.append(template)
+
     return templates
 
 
 def get_template(name):
     """Get a template by name."""
     ensure_templates_dir()
-    template_path = TEMPLATES_DIR / f"{name}.json"
-    
-    if not template_path.exists():
-        return None
-    
-    try:
-        with open(template_path) as f:
-            return json.load(f)
-    except:
-        return None
+    return _read_template(TEMPLATES_DIR / f"{name}.json")
 
 
 def create_template(name, to=None, subject=None, body=None, cc=None):
@@ -59,12 +109,13 @@ def create_template(name, to=None, subject=None, body=None, cc=None):
     }
     
     template_path = TEMPLATES_DIR / f"{name}.json"
-    with open(template_path, "w") as f:
-        json.dump(template, f, indent=2)
-    
-    # Ensure secure permissions
-    os.chmod(template_path, 0o600)
-    
+    # Creating with mode 0o600 directly fuses the open + chmod pair and
+    # closes the window where a fresh file carries default permissions.
+    fd = os.open(template_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(_dumps(template))
+    _TEMPLATE_CACHE.pop(template_path, None)
+
     return template
 
 
@@ -75,27 +126,37 @@ def delete_template(name):
     
     if template_path.exists():
         template_path.unlink()
+        _TEMPLATE_CACHE.pop(template_path, None)
         return True
-    
+
     return False
 
 
+# Matches {{var_name}} placeholders for render_template.
+_VAR_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
 def render_template(name, **kwargs):
     """Render a template with variable substitution."""
     template = get_template(name)
     if not template:
         raise ValueError(f"Template '{name}' not found")
-    
+
+    # Single regex pass per field: each {{var_name}} is replaced via a
+    # dict lookup, so cost is O(len(field)) regardless of how many
+    # variables are supplied. Unknown placeholders are left as-is.
+    # (The old per-variable replace() loop also carried a typo in its
+    # brace format string that made substitution never match.)
+    def _sub(match):
+        value = kwargs.get(match.group(1))
+        return match.group(0) if value is None else str(value)
+
     rendered = {}
     for key, value in template.items():
         if isinstance(value, str):
-            # Simple variable substitution: {{var_name}}
-            rendered_value = value
-            for var_name, var_value in kwargs.items():
-                rendered_value = rendered_value.replace(f"{{{{{var_name}}}}}}}", str(var_value))
-            rendered[key] = rendered_value
+            rendered[key] = _VAR_RE.sub(_sub, value)
         else:
             rendered[key] = value
-    
+
     return rendered
 
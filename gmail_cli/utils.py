@@ -1,76 +1,115 @@
 """Utility functions for Gmail CLI."""
 
+import functools
 import os
 import json
+from datetime import datetime
 from pathlib import Path
-from .shared_auth import (
-    get_default_account as _get_default_account,
-    set_default_account as _set_default_account,
-    list_accounts as _list_accounts,
-    remove_account as _remove_account,
-    set_account_alias as _set_account_alias,
-    remove_account_alias as _remove_account_alias,
-    get_account_aliases as _get_account_aliases,
-    resolve_account as _resolve_account,
-    get_token_path as _get_token_path,
-    get_credentials_path as _get_credentials_path,
-    ensure_token_permissions as _ensure_token_permissions,
-)
+
+# Mirrors google_auth_core.store.GOOGLE_CONFIG_DIR. Defined locally because
+# importing it from google_auth_core drags in the whole google.auth stack,
+# and this path is the fixed, documented location of the shared store.
+GOOGLE_CONFIG_DIR = Path.home() / ".google"
+
+
+def _sa():
+    """Import the shared-auth backend on first use.
+
+    google_auth_core transitively pulls google.auth and googleapiclient —
+    most of the CLI's cold-start import time — so commands that never touch
+    accounts or tokens skip it entirely.
+    """
+    from . import shared_auth
+    return shared_auth
 
 
 def get_default_account():
     """Get the default account name."""
-    return _get_default_account("gmail")
+    return _sa().get_default_account("gmail")
 
 
 def set_default_account(account_name):
     """Set the default account name."""
-    _set_default_account(account_name)
+    _sa().set_default_account(account_name)
 
 
 def list_accounts():
     """List all configured accounts."""
-    return _list_accounts()
+    return _sa().list_accounts()
 
 
 def remove_account(account_name):
     """Remove an account and its token."""
-    return _remove_account(account_name)
+    return _sa().remove_account(account_name)
 
 
 def set_account_alias(alias, account_email):
     """Set an alias for an account."""
-    return _set_account_alias(alias, account_email)
+    return _sa().set_account_alias(alias, account_email)
 
 
 def remove_account_alias(alias):
     """Remove an account alias."""
-    return _remove_account_alias(alias)
+    return _sa().remove_account_alias(alias)
 
 
 def get_account_aliases():
     """Get all account aliases."""
-    return _get_account_aliases()
+    return _sa().get_account_aliases()
 
 
 def resolve_account(account_or_alias):
     """Resolve an account name or alias to the actual account email."""
-    return _resolve_account(account_or_alias)
+    return _sa().resolve_account(account_or_alias)
+
+
+_ACCOUNT_STATE = None  # (config_mtime, accounts, aliases, default)
+
+
+def load_account_state():
+    """Return (accounts, aliases, default) from one pass over the store.
+
+    Commands that render account info previously issued three separate
+    backend calls, each re-reading the config file. The result is memoized
+    against the config file's mtime, so repeated lookups within a process
+    are free and external edits are still picked up.
+    """
+    global _ACCOUNT_STATE
+    sa = _sa()
+    try:
+        mtime = os.stat(sa.GOOGLE_CONFIG_FILE).st_mtime_ns
+    except OSError:
+        mtime = None
+    if _ACCOUNT_STATE is not None and _ACCOUNT_STATE[0] == mtime:
+        return _ACCOUNT_STATE[1:]
+    state = (
+        sa.list_accounts(),
+        sa.get_account_aliases(),
+        sa.get_default_account("gmail"),
+    )
+    _ACCOUNT_STATE = (mtime,) + state
+    return state
 
 
 def get_token_path(account=None):
     """Get the path to the token file for a specific account."""
-    return _get_token_path(account, "gmail")
+    return _sa().get_token_path(account, "gmail")
 
 
+@functools.lru_cache(maxsize=1)
 def get_credentials_path():
-    """Get the path to credentials.json file."""
-    return _get_credentials_path()
+    """Get the path to credentials.json file.
+
+    The backend probes a couple of fixed locations with stat calls; the
+    answer cannot change within a process, so it is cached after the
+    first lookup (tests can reset via ``get_credentials_path.cache_clear()``).
+    """
+    return _sa().get_credentials_path()
 
 
 def ensure_token_permissions(token_path):
     """Ensure token file has secure permissions (600)."""
-    _ensure_token_permissions(token_path)
+    _sa().ensure_token_permissions(token_path)
 
 
 def format_email_address(email_dict):
@@ -84,11 +123,16 @@ def format_date(date_str):
     """Format date string for display."""
     if not date_str:
         return ""
+    # Fast path for the exact shape Gmail returns ("2024-01-02T03:04:05Z"):
+    # the display format is the same string with the T and Z swapped out,
+    # so pure slicing replaces the parse + strftime round-trip that
+    # dominates per-row cost in large listings.
+    if len(date_str) == 20 and date_str[10] == "T" and date_str[19] == "Z":
+        return date_str[:10] + " " + date_str[11:19]
     # Gmail API returns dates in RFC 3339 format
     try:
-        from datetime import datetime
         dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
         return dt.strftime("%Y-%m-%d %H:%M:%S")
-    except:
+    except (ValueError, TypeError):
         return date_str
 
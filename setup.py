@@ -33,6 +33,10 @@ setup(
         "google-auth-oauthlib>=0.5.0",
         "click>=8.0.0",
     ],
+    extras_require={
+        "async": ["aiohttp>=3.8.0"],
+        "speed": ["pybase64>=1.0.0", "orjson>=3.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "gmail=gmail_cli.cli:cli",
@@ -0,0 +1,28 @@
+"""Tests for the API layer's batch ID chunking."""
+
+from gmail_cli.api import _iter_id_chunks
+
+
+def test_iter_id_chunks_caps_chunk_size():
+    """Test that chunks never exceed the requested size."""
+    ids = [f"{i:016x}" for i in range(2500)]
+    chunks = list(_iter_id_chunks(ids, 1000))
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+    assert [msg_id for chunk in chunks for msg_id in chunk] == ids
+
+
+def test_iter_id_chunks_dedupes_preserving_order():
+    """Test that repeated IDs are dropped, keeping first-seen order."""
+    chunks = list(_iter_id_chunks(["a", "b", "a", "c", "b", "d"], 2))
+    assert chunks == [["a", "b"], ["c", "d"]]
+
+
+def test_iter_id_chunks_accepts_generators():
+    """Test that a streaming iterable is consumed without materializing."""
+    chunks = list(_iter_id_chunks((str(i) for i in range(5)), 2))
+    assert chunks == [["0", "1"], ["2", "3"], ["4"]]
+
+
+def test_iter_id_chunks_empty():
+    """Test that no chunks are yielded for empty input."""
+    assert list(_iter_id_chunks([], 1000)) == []
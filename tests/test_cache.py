@@ -0,0 +1,42 @@
+"""Tests for the on-disk query cache's epoch invalidation."""
+
+import pytest
+from unittest.mock import patch
+from gmail_cli import cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    """Point the cache module at a temporary directory and enable it."""
+    with patch.object(cache, "get_token_path", lambda: tmp_path / "token.json"), \
+         patch.object(cache, "_disabled", False):
+        yield tmp_path
+
+
+def test_query_cache_round_trip(cache_dir):
+    """Test that a stored listing is returned for the identical query."""
+    cache.query_put("acct", "is:unread", 50, ["aa11", "bb22"])
+    assert cache.query_get("acct", "is:unread", 50) == ["aa11", "bb22"]
+
+
+def test_query_cache_misses_on_different_key(cache_dir):
+    """Test that account, query and max_results all key the entry."""
+    cache.query_put("acct", "is:unread", 50, ["aa11"])
+    assert cache.query_get("acct", "is:unread", 100) is None
+    assert cache.query_get("other", "is:unread", 50) is None
+
+
+def test_invalidate_queries_expires_cached_listings(cache_dir):
+    """Test that bumping the epoch invalidates earlier entries."""
+    cache.query_put("acct", "is:unread", 50, ["aa11"])
+    cache.invalidate_queries("acct")
+    assert cache.query_get("acct", "is:unread", 50) is None
+
+
+def test_invalidate_queries_is_per_account(cache_dir):
+    """Test that one account's mutations leave other accounts cached."""
+    cache.query_put("acct", "is:unread", 50, ["aa11"])
+    cache.query_put("other", "is:unread", 50, ["bb22"])
+    cache.invalidate_queries("acct")
+    assert cache.query_get("acct", "is:unread", 50) is None
+    assert cache.query_get("other", "is:unread", 50) == ["bb22"]
@@ -0,0 +1,61 @@
+"""Tests for the operation history log."""
+
+import json
+import pytest
+from unittest.mock import patch
+from gmail_cli import history
+
+
+@pytest.fixture
+def history_dir(tmp_path):
+    """Point the history module at a temporary directory."""
+    with patch.multiple(
+        history,
+        GOOGLE_CONFIG_DIR=tmp_path,
+        HISTORY_FILE=tmp_path / "history.jsonl",
+        LEGACY_HISTORY_FILE=tmp_path / "history.json",
+    ):
+        yield tmp_path
+
+
+def test_legacy_history_migrates_to_jsonl(history_dir):
+    """Test that history.json is converted to history.jsonl and removed."""
+    operations = [{"type": "trash", "details": {"id": str(i)}} for i in range(3)]
+    (history_dir / "history.json").write_text(json.dumps({"operations": operations}))
+
+    history.ensure_history_file()
+
+    assert not (history_dir / "history.json").exists()
+    assert history.get_recent_operations(limit=None) == operations
+
+
+def test_get_recent_operations_returns_tail(history_dir):
+    """Test that the limit keeps the newest entries in order."""
+    for i in range(5):
+        history.add_operation("archive", {"id": str(i)}, undoable=False)
+
+    recent = history.get_recent_operations(limit=2)
+    assert [op["details"]["id"] for op in recent] == ["3", "4"]
+
+
+def test_read_tail_drops_partial_first_line(history_dir):
+    """Test that a seek landing mid-entry discards the truncated line."""
+    operations = [{"details": {"id": str(i)}} for i in range(3)]
+    log = "".join(json.dumps(op) + "\n" for op in operations)
+    (history_dir / "history.jsonl").write_text(log)
+
+    # A tail window slightly smaller than the file lands mid first line.
+    with patch.object(history, "_TAIL_BYTES", len(log) - 10):
+        recent = history.get_recent_operations(limit=None)
+
+    assert recent == operations[1:]
+
+
+def test_get_last_undoable_operation(history_dir):
+    """Test that the newest undoable entry is found past non-undoable ones."""
+    history.add_operation("trash", {"id": "a"}, undoable=True, undo_func="untrash")
+    history.add_operation("send", {"id": "b"}, undoable=False)
+
+    operation = history.get_last_undoable_operation()
+    assert operation["type"] == "trash"
+    assert operation["details"]["id"] == "a"
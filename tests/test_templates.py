@@ -0,0 +1,38 @@
+"""Tests for email template rendering."""
+
+import pytest
+from unittest.mock import patch
+from gmail_cli import templates
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    """Point the templates module at a temporary directory."""
+    templates._TEMPLATE_CACHE.clear()
+    with patch.object(templates, "TEMPLATES_DIR", tmp_path), \
+         patch.object(templates, "_DIR_ENSURED", False):
+        yield tmp_path
+
+
+def test_render_template_substitutes_variables(templates_dir):
+    """Test that {{var}} placeholders are replaced with supplied values."""
+    templates.create_template(
+        "greet", to="{{recipient}}", subject="Hello {{user}}", body="Hi {{user}}!"
+    )
+    rendered = templates.render_template("greet", recipient="a@b.com", user="Ann")
+    assert rendered["to"] == "a@b.com"
+    assert rendered["subject"] == "Hello Ann"
+    assert rendered["body"] == "Hi Ann!"
+
+
+def test_render_template_leaves_unknown_placeholders(templates_dir):
+    """Test that placeholders without a supplied value are kept as-is."""
+    templates.create_template("partial", body="Hi {{user}}, re: {{topic}}")
+    rendered = templates.render_template("partial", user="Ann")
+    assert rendered["body"] == "Hi Ann, re: {{topic}}"
+
+
+def test_render_template_missing_raises(templates_dir):
+    """Test that rendering a nonexistent template raises ValueError."""
+    with pytest.raises(ValueError):
+        templates.render_template("nonexistent")